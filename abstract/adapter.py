@@ -3,6 +3,8 @@ from typing import Tuple
 
 
 class Adapter(abc.ABC):
+    shared = False  # whether stages with the same mode share one instance, only enable it for stateless adapters
+
     @abc.abstractmethod
     def convert(self, *args: Tuple) -> Tuple:
         pass
@@ -1,7 +1,79 @@
-from typing import Any, Tuple
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from dto.seq.profile import StageProfile
+from utils.parallel import ordered_map
+from utils.profiler import measure
+
+
+class FrameStream:
+    '''
+        Per-frame part of a processor.
+
+        `process_frame(frame_name, item)` is called for every frame, in order, with the items of `items`, and its
+        result is passed to `collect`. Frames are either pushed one by one (streaming execution of Converter) or all
+        at once by `close`, which also returns `output` passed through the finalizers.
+    '''
+
+    def __init__(self, frame_names: List[str], items: Iterable[Any], process_frame: Callable[[str, Any], Any],
+                 collect: Optional[Callable[[Any], None]] = None, output: Tuple = ()):
+        self.frame_names = list(frame_names)
+        self.output = output
+        self._items = iter(items)
+        self._process_frame = process_frame
+        self._collect = collect
+        self._finalizers: List[Callable[..., Tuple]] = []
+        self._index = 0
+        self.profile: Optional[StageProfile] = None  # processing of frames is measured as the processor phase
+
+    def add_finalizer(self, finalizer: Callable[..., Tuple]) -> None:
+        self._finalizers.append(finalizer)
+
+    def push(self, frame_name: str) -> bool:
+        '''Processes `frame_name` if it is the next frame of the stream, returns whether it was processed.'''
+        if self._index >= len(self.frame_names) or self.frame_names[self._index] != frame_name:
+            return False
+
+        self._index += 1
+
+        with measure(self.profile, 'processor'):
+            result = self._process_frame(frame_name, next(self._items))
+
+            if self._collect is not None:
+                self._collect(result)
+
+        return True
+
+    def close(self, map_fn: Callable[..., Iterator[Any]] = map) -> Tuple:
+        '''Processes the remaining frames with `map_fn` and returns the finalized output.'''
+        frame_names = self.frame_names[self._index:]
+        self._index = len(self.frame_names)
+
+        with measure(self.profile, 'processor'):
+            for result in map_fn(self._process_frame, frame_names, self._items):
+                if self._collect is not None:
+                    self._collect(result)
+
+        output = self.output
+
+        for finalizer in self._finalizers:
+            output = finalizer(*output)
+
+        return output
 
 
 class Processor:
+    streamable = False  # whether `open_stream` is implemented
+    shared = False  # whether stages with the same mode share one instance, only enable it for stateless processors
+
+    def __init__(self, workers: int = 1, executor: str = 'thread') -> None:
+        '''
+            Args:
+                workers: Number of workers used by `map_frames`, frames are processed serially if it is 1.
+                executor: 'thread' or 'process'.
+        '''
+        self.workers = workers
+        self.executor = executor
+
     def preprocess(self, *args: Any) -> Tuple:
         return args
 
@@ -11,6 +83,12 @@ class Processor:
     def postprocess(self, *args: Any) -> Tuple:
         return args
 
+    def open_stream(self, *args: Any) -> FrameStream:
+        raise NotImplementedError(f'{self.__class__.__name__} does not support streaming.')
+
+    def map_frames(self, fn: Callable[..., Any], *iterables: Iterable) -> Iterator[Any]:
+        return ordered_map(fn, *iterables, workers=self.workers, executor=self.executor)
+
     def __call__(self, *args: Any) -> Tuple:
         output = self.preprocess(*args)
         output = self.process(*output)
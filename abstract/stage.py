@@ -1,16 +1,31 @@
 import inspect
 from pathlib import Path
-from typing import Any, Tuple, Type, Union
+from typing import Any, Optional, Tuple, Type, Union
 
 from abstract.adapter import InAdapter, OutAdapter
-from abstract.processor import Processor
+from abstract.processor import FrameStream, Processor
+from dto.seq.profile import StageProfile
 from utils.config import CfgNode
+from utils.profiler import measure, measured
 
 
 class Stage:
+    # `SeqInfo` fields read and written by the stage, used by the dag execution of Converter. Per-frame fields are
+    # written as `frame_infos.<field>`. Stages which do not declare them are run alone, with everything before them
+    # finished, and receive the output of the previous stage.
+    reads: Optional[Tuple[str, ...]] = None
+    writes: Optional[Tuple[str, ...]] = None
+    open_writes: Tuple[str, ...] = ()  # fields of `writes` already set once the stream of the stage is opened
+
     def __init__(self, mode: str = None, config_path: str = None,
                  in_adapter_mode: str = None, out_adapter_mode: str = None,
-                 adapter_config_path: str = None):
+                 adapter_config_path: str = None, executor: str = 'thread'):
+        '''
+            Args:
+                executor: 'thread' or 'process', where the stage runs with the dag execution of Converter.
+        '''
+        self.executor = executor
+        self.name = self.__class__.__name__  # set to the config key by Converter
         self.processor = self._create_processor(mode, config_path,
                                                 default_processor_cls=Processor,
                                                 default_config_filename='config.yaml')
@@ -27,14 +42,71 @@ class Stage:
     def postprocess(self, *args: Any) -> Tuple:
         return args
 
+    @property
+    def streamable(self) -> bool:
+        return getattr(self.processor, 'streamable', False)
+
+    @property
+    def declared(self) -> bool:
+        return self.reads is not None and self.writes is not None
+
+    def get_profile(self, args: Tuple) -> Optional[StageProfile]:
+        # Stages are profiled when the sequence info they receive holds a profile, see Converter
+        profile = getattr(args[0], 'profile', None) if args else None
+
+        if profile is None:
+            return None
+
+        return profile.setdefault(self.name, StageProfile())
+
+    def count_frames(self, profile: Optional[StageProfile], args: Tuple) -> None:
+        if profile is not None:
+            profile.frames = len(getattr(args[0], 'frame_names', None) or [])
+
     def __call__(self, *args: Any) -> Tuple:
-        output = self.in_adapter(args)
-        output = self.preprocess(*output)
-        output = self.processor(*output)
-        output = self.postprocess(*output)
-        output = self.out_adapter(args, output)
+        profile = self.get_profile(args)
+
+        with measure(profile, 'in_adapter'):
+            output = self.in_adapter(args)
+        with measure(profile, 'preprocess'):
+            output = self.preprocess(*output)
+        with measure(profile, 'processor'):
+            output = self.processor(*output)
+        with measure(profile, 'postprocess'):
+            output = self.postprocess(*output)
+        with measure(profile, 'out_adapter'):
+            output = self.out_adapter(args, output)
+
+        self.count_frames(profile, args)
         return output
 
+    def open_stream(self, *args: Any) -> FrameStream:
+        '''
+            Runs the per-sequence part of the stage before the processor and returns the per-frame part. The rest
+            of the stage (processor postprocess, postprocess and out adapter) runs when the stream is closed.
+        '''
+        profile = self.get_profile(args)
+
+        with measure(profile, 'in_adapter'):
+            output = self.in_adapter(args)
+        with measure(profile, 'preprocess'):
+            output = self.preprocess(*output)
+        with measure(profile, 'processor'):
+            output = self.processor.preprocess(*output)
+            stream = self.processor.open_stream(*output)
+
+        stream.profile = profile
+        stream.add_finalizer(measured(profile, 'processor', self.processor.postprocess))
+        stream.add_finalizer(measured(profile, 'postprocess', self.postprocess))
+        stream.add_finalizer(measured(profile, 'out_adapter', lambda *output: self.out_adapter(args, output)))
+
+        def count_frames(*output: Any) -> Tuple:
+            self.count_frames(profile, args)
+            return output
+
+        stream.add_finalizer(count_frames)
+        return stream
+
     def _create_processor(self, mode: str = None, config_path: Union[str, Path] = None, *,
                           default_processor_cls: Type[Any], default_config_filename: str = 'config.yaml') -> Any:
         if config_path is None:
@@ -1,19 +1,175 @@
+import contextlib
+import hashlib
+import inspect
+import shutil
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from abstract.processor import FrameStream
 from abstract.project import Project
+from abstract.stage import Stage
+from dto.seq.manifest import Manifest
+from dto.seq.profile import SeqProfile
 from dto.seq.seq_info import SeqInfo
+from utils.common import move_tree
 from utils.config import CfgNode
+from utils.scheduler import build_stage_graph, run_stage_graph
+
+EXECUTIONS = ('sequential', 'streaming', 'dag')
+STAGING_DIR = '.converter/staging'
 
 
 class Converter(Project):
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, execution: str = 'sequential', incremental: bool = False,
+                 content_hash: bool = False, profile: bool = False):
+        '''
+            Args:
+                config_path: Path to the converter config.
+                execution:
+                    'sequential': stages run one after another over the whole sequence.
+                    'streaming': consecutive streamable stages are grouped and each frame goes through the whole
+                        group before the next frame is read, other stages run over the whole sequence.
+                    'dag': stages run as soon as the stages they depend on (see `Stage.reads` and `Stage.writes`) are
+                        finished, in the thread or process pool given by `Stage.executor`.
+                incremental: Whether to skip sequences whose inputs and config did not change since they were
+                    converted into the same output folder, see `Manifest`.
+                content_hash: Whether input files are fingerprinted by content instead of size and mtime.
+                profile: Whether to measure the phases of every stage, the report of a sequence is written to
+                    `SeqProfile.get_file(out_dir, seq_name)`.
+        '''
         super(Converter, self).__init__(config_path)
+
+        if execution not in EXECUTIONS:
+            raise ValueError(f'Unsupported execution {execution}, expected one of {EXECUTIONS}.')
+
+        self.execution = execution
+        self.incremental = incremental
+        self.content_hash = content_hash
+        self.profile = profile
         config = CfgNode.load_yaml_with_base(str(self.config_path))
-        self.stages, _ = config.eval()
+        config_dump = config.dump()
+        config, _ = config.eval()
+
+        # Non-stage entries, e.g. `data_dirs`, are read by the scripts, see `CfgNode.eval_key`
+        self.stages = {name: value for name, value in config.items() if isinstance(value, Stage)}
+
+        for name, stage in self.stages.items():
+            stage.name = name
+
+        self.stage_graph = build_stage_graph(self.stages)
+        self.config_hash = self.get_config_hash(config_dump)
+
+    def get_config_hash(self, config_dump: str) -> str:
+        # Mode configs of the stages are part of the effective config
+        sha1 = hashlib.sha1(config_dump.encode('utf-8'))
+
+        for stage_cls in sorted({stage.__class__ for stage in self.stages.values()}, key=lambda cls: cls.__module__):
+            for filename in ('config.yaml', 'adapter.yaml'):
+                config_file = Path(inspect.getfile(stage_cls)).with_name(filename)
+
+                if config_file.exists():
+                    sha1.update(config_file.read_bytes())
+
+        return sha1.hexdigest()
+
+    def run(self, seq_dir: str, out_dir: str) -> Optional[SeqInfo]:
+        seq_name = Path(seq_dir).name
+
+        if self.incremental:
+            manifest_file = str(Manifest.get_file(out_dir, seq_name))
+            inputs = Manifest.fingerprint(seq_dir, self.content_hash)
+            manifest = Manifest.fromfile(manifest_file)
+
+            if manifest is not None:
+                if manifest.is_up_to_date(self.config_hash, inputs):
+                    return None
+
+                # Outputs of the previous conversion may not be produced again, the manifest is only written back
+                # once the sequence is converted, so an interrupted conversion is run again
+                manifest.rm_outputs(out_dir)
+                Path(manifest_file).unlink()
+
+        # Incremental conversions write into a staging folder which is moved into out_dir only once the whole
+        # sequence is converted, so the manifest lists exactly the outputs of the sequence and a sequence failing
+        # halfway leaves no partial output behind to be skipped or organized on the next run
+        staging_dir = Path(out_dir).joinpath(STAGING_DIR, seq_name) if self.incremental else None
 
-    def run(self, seq_dir: str, out_dir: str) -> SeqInfo:
-        seq_info = SeqInfo(seq_dir, out_dir)
-        output = (seq_info,)
+        if staging_dir is not None:
+            shutil.rmtree(staging_dir, ignore_errors=True)
 
-        for stage in self.stages:
-            output = self.stages[stage](*output)
+        seq_info = SeqInfo(seq_dir, str(staging_dir or out_dir))
+        output: Tuple = (seq_info,)
+
+        if self.profile:
+            seq_info.profile = {}
+            start_time = time.perf_counter()
+
+        try:
+            if self.execution == 'streaming':
+                self.run_streaming(output)
+            elif self.execution == 'dag':
+                self.run_dag(seq_info)
+            else:
+                for stage in self.stages:
+                    output = self.stages[stage](*output)
+
+            if staging_dir is not None:
+                outputs = move_tree(str(staging_dir), out_dir)
+        finally:
+            if staging_dir is not None:
+                # Outputs of a failed sequence are dropped with the staging folder, successful ones are moved already
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+                # The staging folder is shared with the sequences of other processes, the last one removes it
+                for staging_parent in (staging_dir.parent, staging_dir.parents[1]):
+                    with contextlib.suppress(OSError):
+                        staging_parent.rmdir()
+
+        seq_info.out_dir = out_dir
+
+        if seq_info.profile is not None:
+            seq_profile = SeqProfile(seq_dir, time.perf_counter() - start_time, seq_info.profile)
+            seq_profile.tofile(str(SeqProfile.get_file(out_dir, seq_name)))
+
+        if self.incremental:
+            Manifest(seq_dir, self.config_hash, inputs, outputs).tofile(manifest_file)
 
         return seq_info
+
+    def run_streaming(self, output: Tuple) -> Tuple:
+        streams: List[FrameStream] = []
+
+        for stage in self.stages.values():
+            if stage.streamable:
+                # Streamable stages pass the sequence info along, so the next stage can be opened right away
+                stream = stage.open_stream(*output)
+                streams.append(stream)
+                output = stream.output
+            else:
+                if streams:
+                    output = self.flush_streams(streams)
+
+                output = stage(*output)
+
+        if streams:
+            output = self.flush_streams(streams)
+
+        return output
+
+    @staticmethod
+    def flush_streams(streams: List[FrameStream]) -> Tuple:
+        # Frames of later streams are a subsequence of the frames of the first one, since stages only narrow down
+        # `SeqInfo.frame_names`. Frames which are left over are processed when the streams are closed.
+        for frame_name in streams[0].frame_names:
+            for stream in streams:
+                stream.push(frame_name)
+
+        for stream in streams:
+            output = stream.close()
+
+        streams.clear()
+        return output
+
+    def run_dag(self, seq_info: SeqInfo) -> Tuple:
+        return run_stage_graph(self.stage_graph, seq_info)
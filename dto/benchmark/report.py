@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from abstract.dto import DTO
+from dto.seq.profile import StageProfile
+from utils.common import open_file
+
+
+class BenchmarkRun(DTO):
+    def __init__(self, wall_time: float, frames: int, read_bytes: int, write_bytes: int):
+        super(BenchmarkRun, self).__init__()  # type: ignore[safe-super]
+        self.wall_time = wall_time
+        self.frames = frames
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+
+    @property
+    def frames_per_s(self) -> float:
+        return self.frames / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def read_mb_per_s(self) -> float:
+        return self.read_bytes / 1e6 / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def write_mb_per_s(self) -> float:
+        return self.write_bytes / 1e6 / self.wall_time if self.wall_time > 0 else 0.0
+
+    @classmethod
+    def parse(cls, run: dict) -> BenchmarkRun:
+        return cls(run['wall_time'], run['frames'], run['read_bytes'], run['write_bytes'])
+
+    @property
+    def json(self) -> dict:
+        run = {
+            'wall_time': self.wall_time,
+            'frames': self.frames,
+            'read_bytes': self.read_bytes,
+            'write_bytes': self.write_bytes,
+            'frames_per_s': self.frames_per_s,
+            'read_mb_per_s': self.read_mb_per_s,
+            'write_mb_per_s': self.write_mb_per_s,
+        }
+        return run
+
+
+class BenchmarkReport(DTO):
+    '''
+        Result of converting the same sequences `repeats` times with one config. `stages` are the phases of every
+        stage averaged over the runs and `peak_rss` is the peak resident memory of the benchmark process in bytes.
+    '''
+
+    def __init__(self, config: str, execution: str, seq_dirs: List[str], runs: List[BenchmarkRun],
+                 stages: Dict[str, StageProfile], peak_rss: int, created: Optional[str] = None):
+        super(BenchmarkReport, self).__init__()  # type: ignore[safe-super]
+        self.config = config
+        self.execution = execution
+        self.seq_dirs = seq_dirs
+        self.runs = runs
+        self.stages = stages
+        self.peak_rss = peak_rss
+        self.created = created
+
+    @property
+    def best_run(self) -> BenchmarkRun:
+        # The fastest run is the least disturbed by the rest of the machine
+        return min(self.runs, key=lambda run: run.wall_time)
+
+    @classmethod
+    def parse(cls, report: dict) -> BenchmarkReport:
+        runs = [BenchmarkRun.parse(run) for run in report['runs']]
+        stages = {name: StageProfile.parse(stage) for name, stage in report['stages'].items()}
+        return cls(report['config'], report['execution'], report['seq_dirs'], runs, stages, report['peak_rss'],
+                   report.get('created'))
+
+    @property
+    def json(self) -> dict:
+        report = {
+            'config': self.config,
+            'execution': self.execution,
+            'seq_dirs': self.seq_dirs,
+            'created': self.created,
+            'runs': [run.json for run in self.runs],
+            'stages': {name: stage.json for name, stage in self.stages.items()},
+            'peak_rss': self.peak_rss,
+        }
+        return report
+
+    @classmethod
+    def fromfile(cls, file_path: str) -> Optional[BenchmarkReport]:
+        if not Path(file_path).exists():
+            return None
+
+        with open(file_path, mode='r', encoding='utf-8') as f:
+            report = json.load(f)
+
+        return cls.parse(report)
+
+    def tofile(self, file_path: str) -> None:
+        with open_file(file_path, mode='w', encoding='utf-8') as f:
+            json.dump(self.json, f, indent=4)
+
+
+class KernelReport(DTO):
+    '''Time per call in seconds of geometry kernels, keyed by `utils.kernel_bench.get_timing_key`.'''
+
+    def __init__(self, timings: Dict[str, float], created: Optional[str] = None):
+        super(KernelReport, self).__init__()  # type: ignore[safe-super]
+        self.timings = timings
+        self.created = created
+
+    @classmethod
+    def parse(cls, report: dict) -> KernelReport:
+        return cls(report['timings'], report.get('created'))
+
+    @property
+    def json(self) -> dict:
+        report = {
+            'created': self.created,
+            'timings': self.timings,
+        }
+        return report
+
+    @classmethod
+    def fromfile(cls, file_path: str) -> Optional[KernelReport]:
+        if not Path(file_path).exists():
+            return None
+
+        with open(file_path, mode='r', encoding='utf-8') as f:
+            report = json.load(f)
+
+        return cls.parse(report)
+
+    def tofile(self, file_path: str) -> None:
+        with open_file(file_path, mode='w', encoding='utf-8') as f:
+            json.dump(self.json, f, indent=4)
@@ -3,8 +3,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
-from natsort import natsorted
-
 from abstract.dto import DTO
 
 from .frame import Frame
@@ -17,6 +15,8 @@ class Calib(DTO):
 
     @classmethod
     def parse(cls, calib_dir: str) -> Calib:
+        from natsort import natsorted
+
         frame_files = natsorted(Path(calib_dir).glob('*.txt'), key=lambda file: file.stem)
         frames = [Frame.parse(str(frame_file)) for frame_file in frame_files]
         return cls(frames)
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import cv2
 import numpy as np
 
 from abstract.dto import DTO
@@ -20,6 +19,8 @@ class Frame(DTO):
 
     @property
     def data(self) -> np.ndarray:
+        import cv2
+
         if self._data is None:
             return cv2.imread(self.frame_file)
         else:
@@ -35,6 +36,8 @@ class Frame(DTO):
         return cls(frame_id, frame_file)
 
     def tofile(self, image_dir: str) -> None:
+        import cv2
+
         image_file = Path(image_dir).joinpath(self.name)
         image_file.parent.mkdir(parents=True, exist_ok=True)
         cv2.imwrite(str(image_file), self.data)
@@ -3,8 +3,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
-from natsort import natsorted
-
 from abstract.dto import DTO
 
 from .frame import Frame
@@ -17,6 +15,8 @@ class Image(DTO):
 
     @classmethod
     def parse(cls, image_dir: str) -> Image:
+        from natsort import natsorted
+
         frame_files = natsorted(Path(image_dir).glob('*.png'), key=lambda file: file.stem)
         frames = [Frame.parse(str(frame_file)) for frame_file in frame_files]
         return cls(frames)
@@ -3,8 +3,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
-from natsort import natsorted
-
 from .base import Element
 from .frame import Frame
 
@@ -16,6 +14,8 @@ class Label(Element):
 
     @classmethod
     def parse(cls, label_dir: str) -> Label:
+        from natsort import natsorted
+
         frame_files = natsorted(Path(label_dir).glob('*.txt'))
         frames = [Frame.parse(str(frame_file)) for frame_file in frame_files]
         return cls(frames)
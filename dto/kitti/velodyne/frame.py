@@ -1,43 +1,123 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 
 from abstract.dto import DTO
+from utils.point_cloud import (COMPACT_HEADER, COMPACT_SUFFIX, COMPRESSIONS,
+                               decode_compact, decode_compact_header,
+                               encode_compact)
 
 
 class Frame(DTO):
-    def __init__(self, frame_id: int, frame_file: str = None, data: np.ndarray = None):
+    '''
+        Point cloud of a frame, x, y, z and the other features of every point as float32. `data` is the flat array
+        stored in KITTI .bin files and `points` the (N, n_feature) view of it.
+
+        Frames parsed from a file are memory mapped on the first access of `data` or `points` and the mapping is
+        cached, so reading them again, or only a few points, does not read the whole file. The mapping is read-only.
+
+        With a `compression` of `utils.point_cloud.COMPRESSIONS`, frames are written as `COMPACT_SUFFIX` files of
+        the compact format instead of raw float32, and are decoded back to float32 when read.
+    '''
+
+    def __init__(self, frame_id: int, frame_file: str = None, data: np.ndarray = None, n_feature: int = 4,
+                 compression: Optional[str] = None):
         super(Frame, self).__init__()
         if frame_file is None and data is None:
             raise ValueError('`frame_file` or `data` must be provided.')
 
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f'Unsupported compression {compression}, expected one of {COMPRESSIONS}.')
+
         self.frame_id = frame_id
         self.frame_file = frame_file
+        self.n_feature = n_feature
+        self.compression = compression
         self._data = data
+        self._file_data: Optional[np.ndarray] = None  # cached mapping or decoding of `frame_file`
+
+    @property
+    def is_compact(self) -> bool:
+        return self.frame_file is not None and Path(self.frame_file).suffix == COMPACT_SUFFIX
 
     @property
     def data(self) -> np.ndarray:
-        if self._data is None:
-            return np.fromfile(self.frame_file, dtype=np.float32)
-        else:
+        if self._data is not None:
             return self._data
 
+        return self.points.reshape(-1)
+
     @data.setter
     def data(self, dt: np.ndarray) -> None:
         self._data = dt.astype(np.float32)
 
+    @property
+    def points(self) -> np.ndarray:
+        if self._data is not None:
+            return self._data.reshape(-1, self.n_feature)
+
+        if self._file_data is None:
+            if self.is_compact:
+                self._file_data = decode_compact(Path(self.frame_file).read_bytes())
+            elif self.n_points == 0:
+                # Empty files cannot be memory mapped
+                self._file_data = np.empty((0, self.n_feature), dtype=np.float32)
+            else:
+                self._file_data = np.memmap(self.frame_file, dtype=np.float32, mode='r',
+                                            shape=(self.n_points, self.n_feature))
+
+        return self._file_data
+
+    @property
+    def n_points(self) -> int:
+        '''Number of points, from the file size or the header of compact files if the data is not loaded.'''
+        if self._data is not None:
+            return self._data.size // self.n_feature
+
+        if self._file_data is not None:
+            return len(self._file_data)
+
+        if self.is_compact:
+            with open(self.frame_file, mode='rb') as f:
+                return decode_compact_header(f.read(COMPACT_HEADER.itemsize))[2]
+
+        n_bytes = Path(self.frame_file).stat().st_size
+        point_size = self.n_feature * np.dtype(np.float32).itemsize
+
+        if n_bytes % point_size != 0:
+            raise ValueError(f'Size of {self.frame_file} is not a multiple of {self.n_feature} float32 features.')
+
+        return n_bytes // point_size
+
+    def release(self) -> None:
+        '''Drops the cached data of the file, it is read again on the next access. Assigned data is kept.'''
+        self._file_data = None
+
     @property
     def name(self) -> str:
-        return f'{self.frame_id:06d}.bin'
+        suffix = COMPACT_SUFFIX if self.compression is not None else '.bin'
+        return f'{self.frame_id:06d}{suffix}'
 
     @classmethod
-    def parse(cls, frame_file: str) -> Frame:
+    def parse(cls, frame_file: str, n_feature: int = 4) -> Frame:
         frame_id = int(Path(frame_file).stem)
-        return cls(frame_id, frame_file)
+        compression = None
+
+        # Compact files record their compression and number of features
+        if Path(frame_file).suffix == COMPACT_SUFFIX:
+            with open(frame_file, mode='rb') as f:
+                compression, n_feature, _ = decode_compact_header(f.read(COMPACT_HEADER.itemsize))
+
+        return cls(frame_id, frame_file, n_feature=n_feature, compression=compression)
 
     def tofile(self, velodyne_dir: str) -> None:
         bin_file = Path(velodyne_dir).joinpath(self.name)
         bin_file.parent.mkdir(parents=True, exist_ok=True)
-        self.data.tofile(str(bin_file))
+
+        if self.compression is not None:
+            bin_file.write_bytes(encode_compact(self.points, self.compression))
+        else:
+            self.data.tofile(str(bin_file))
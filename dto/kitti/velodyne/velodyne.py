@@ -1,26 +1,41 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
-
-from natsort import natsorted
+from typing import Iterator, List
 
 from abstract.dto import DTO
+from utils.point_cloud import COMPACT_SUFFIX
 
 from .frame import Frame
 
 
 class Velodyne(DTO):
+    '''
+        Frames of a velodyne folder. Parsing only lists the files, iterating maps the frames one at a time and drops
+        the mapping of each frame once the next one is requested, so a whole dataset can be read in constant memory.
+    '''
+
     def __init__(self, frames: List[Frame]):
         super(Velodyne, self).__init__()
         self.frames = frames
 
     @classmethod
-    def parse(cls, velodyne_dir: str) -> Velodyne:
-        frame_files = natsorted(Path(velodyne_dir).glob('*.bin'), key=lambda file: file.stem)
-        frames = [Frame.parse(str(frame_file)) for frame_file in frame_files]
+    def parse(cls, velodyne_dir: str, n_feature: int = 4) -> Velodyne:
+        from natsort import natsorted
+
+        frame_files = [file for file in Path(velodyne_dir).glob('*') if file.suffix in ('.bin', COMPACT_SUFFIX)]
+        frame_files = natsorted(frame_files, key=lambda file: file.stem)
+        frames = [Frame.parse(str(frame_file), n_feature) for frame_file in frame_files]
         return cls(frames)
 
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __iter__(self) -> Iterator[Frame]:
+        for frame in self.frames:
+            yield frame
+            frame.release()
+
     def tofile(self, velodyne_dir: str) -> None:
         for frame in self.frames:
             frame.tofile(velodyne_dir)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from abstract.dto import DTO
+from utils.common import open_file
+
+MANIFEST_DIR = '.converter/manifest'
+
+Fingerprint = Union[str, List[int]]
+
+
+class Manifest(DTO):
+    '''
+        Record of a converted sequence: fingerprints of its input files, hash of the effective config and files
+        produced in the output folder. A sequence whose inputs and config did not change is not converted again.
+    '''
+
+    def __init__(self, seq_dir: str, config_hash: str, inputs: Dict[str, Fingerprint],
+                 outputs: Optional[List[str]] = None):
+        super(Manifest, self).__init__()  # type: ignore[safe-super]
+        self.seq_dir = seq_dir
+        self.config_hash = config_hash
+        self.inputs = inputs  # path relative to seq_dir -> [size, mtime_ns] or content hash
+        self.outputs = outputs if outputs is not None else []  # paths relative to out_dir
+
+    @staticmethod
+    def get_file(out_dir: str, seq_name: str) -> Path:
+        return Path(out_dir).joinpath(MANIFEST_DIR, f'{seq_name}.json')
+
+    @staticmethod
+    def fingerprint(seq_dir: str, content_hash: bool = False) -> Dict[str, Fingerprint]:
+        inputs: Dict[str, Fingerprint] = {}
+
+        for file in sorted(Path(seq_dir).rglob('*')):
+            if not file.is_file():
+                continue
+
+            if content_hash:
+                with file.open(mode='rb') as f:
+                    fingerprint: Fingerprint = hashlib.sha1(f.read()).hexdigest()
+            else:
+                stat = file.stat()
+                fingerprint = [stat.st_size, stat.st_mtime_ns]
+
+            inputs[file.relative_to(seq_dir).as_posix()] = fingerprint
+
+        return inputs
+
+    @classmethod
+    def parse(cls, manifest: dict) -> Manifest:
+        return cls(manifest['seq_dir'], manifest['config_hash'], manifest['inputs'], manifest['outputs'])
+
+    @property
+    def json(self) -> dict:
+        manifest = {
+            'seq_dir': self.seq_dir,
+            'config_hash': self.config_hash,
+            'inputs': self.inputs,
+            'outputs': self.outputs,
+        }
+        return manifest
+
+    @classmethod
+    def fromfile(cls, file_path: str) -> Optional[Manifest]:
+        if not Path(file_path).exists():
+            return None
+
+        with open(file_path, mode='r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        return cls.parse(manifest)
+
+    def tofile(self, file_path: str) -> None:
+        with open_file(file_path, mode='w', encoding='utf-8') as f:
+            json.dump(self.json, f, indent=4)
+
+    def is_up_to_date(self, config_hash: str, inputs: Dict[str, Fingerprint]) -> bool:
+        return self.config_hash == config_hash and self.inputs == inputs
+
+    def rm_outputs(self, out_dir: str) -> None:
+        for output in self.outputs:
+            Path(out_dir).joinpath(output).unlink(missing_ok=True)
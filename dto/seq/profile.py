@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from abstract.dto import DTO
+from utils.common import open_file
+
+PROFILE_DIR = '.converter/profile'
+
+
+class PhaseProfile(DTO):
+    def __init__(self, wall_time: float = 0.0, cpu_time: float = 0.0, read_bytes: int = 0, write_bytes: int = 0,
+                 calls: int = 0):
+        super(PhaseProfile, self).__init__()  # type: ignore[safe-super]
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+        self.calls = calls
+
+    def add(self, wall_time: float, cpu_time: float, read_bytes: int, write_bytes: int, calls: int = 1) -> None:
+        self.wall_time += wall_time
+        self.cpu_time += cpu_time
+        self.read_bytes += read_bytes
+        self.write_bytes += write_bytes
+        self.calls += calls
+
+    @classmethod
+    def parse(cls, phase: dict) -> PhaseProfile:
+        return cls(phase['wall_time'], phase['cpu_time'], phase['read_bytes'], phase['write_bytes'], phase['calls'])
+
+    @property
+    def json(self) -> dict:
+        phase = {
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'read_bytes': self.read_bytes,
+            'write_bytes': self.write_bytes,
+            'calls': self.calls,
+        }
+        return phase
+
+
+class StageProfile(DTO):
+    def __init__(self, phases: Optional[Dict[str, PhaseProfile]] = None, frames: int = 0):
+        super(StageProfile, self).__init__()  # type: ignore[safe-super]
+        self.phases = phases if phases is not None else {}
+        self.frames = frames
+
+    @classmethod
+    def parse(cls, stage: dict) -> StageProfile:
+        phases = {name: PhaseProfile.parse(phase) for name, phase in stage['phases'].items()}
+        return cls(phases, stage['frames'])
+
+    @property
+    def json(self) -> dict:
+        stage = {
+            'phases': {name: phase.json for name, phase in self.phases.items()},
+            'frames': self.frames,
+        }
+        return stage
+
+
+class SeqProfile(DTO):
+    def __init__(self, seq_dir: str, wall_time: float, stages: Dict[str, StageProfile]):
+        super(SeqProfile, self).__init__()  # type: ignore[safe-super]
+        self.seq_dir = seq_dir
+        self.wall_time = wall_time
+        self.stages = stages
+
+    @staticmethod
+    def get_file(out_dir: str, seq_name: str) -> Path:
+        return Path(out_dir).joinpath(PROFILE_DIR, f'{seq_name}.json')
+
+    @classmethod
+    def parse(cls, profile: dict) -> SeqProfile:
+        stages = {name: StageProfile.parse(stage) for name, stage in profile['stages'].items()}
+        return cls(profile['seq_dir'], profile['wall_time'], stages)
+
+    @property
+    def json(self) -> dict:
+        profile = {
+            'seq_dir': self.seq_dir,
+            'wall_time': self.wall_time,
+            'stages': {name: stage.json for name, stage in self.stages.items()},
+        }
+        return profile
+
+    @classmethod
+    def fromfile(cls, file_path: str) -> Optional[SeqProfile]:
+        if not Path(file_path).exists():
+            return None
+
+        with open(file_path, mode='r', encoding='utf-8') as f:
+            profile = json.load(f)
+
+        return cls.parse(profile)
+
+    def tofile(self, file_path: str) -> None:
+        with open_file(file_path, mode='w', encoding='utf-8') as f:
+            json.dump(self.json, f, indent=4)
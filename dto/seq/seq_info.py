@@ -1,11 +1,13 @@
 from pathlib import Path
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 
 from abstract.dto import DTO
+from utils.transform_graph import TransformGraph
 
 from .frame_info import FrameInfo
+from .profile import StageProfile
 
 
 class SeqInfo(DTO):
@@ -19,31 +21,35 @@ class SeqInfo(DTO):
         self.calib_extrinsic: Optional[np.ndarray] = None
         self.calib_intrinsic: Optional[np.ndarray] = None
         self.bin_pc_transform_matrix: Optional[np.ndarray] = None
+        self.transforms: Optional[TransformGraph] = None  # between 'lidar', 'camera', 'kitti_velo' and 'image'
 
         self.pcd_file: Optional[str] = None
         self.image_file: Optional[str] = None
         self.calib_file: Optional[str] = None
         self.frame_names: Optional[List[str]] = None
-        self.frame_infos: Optional[List[FrameInfo]] = None
+        self._frame_infos: Optional[Dict[str, FrameInfo]] = None  # frame name -> info, in insertion order
 
         self.image_size: Optional[Tuple[int, int]] = None
         self.resized_image_size: Optional[Tuple[int, int]] = None
 
+        self.profile: Optional[Dict[str, StageProfile]] = None  # stage name -> profile, None if not profiled
+
     @property
     def seq_name(self) -> str:
         seq_dir = Path(self.seq_dir)
         return seq_dir.name
 
-    def get_frame_info(self, frame_name: str) -> Optional[FrameInfo]:
-        frame_info = None
+    @property
+    def frame_infos(self) -> Optional[List[FrameInfo]]:
+        return list(self._frame_infos.values()) if self._frame_infos is not None else None
 
-        if self.frame_infos:
-            for info in self.frame_infos:
-                if info.frame_name == frame_name:
-                    frame_info = info
-                    break
+    @frame_infos.setter
+    def frame_infos(self, frame_infos: Optional[Iterable[FrameInfo]]) -> None:
+        self._frame_infos = ({frame_info.frame_name: frame_info for frame_info in frame_infos}
+                             if frame_infos is not None else None)
 
-        return frame_info
+    def get_frame_info(self, frame_name: str) -> Optional[FrameInfo]:
+        return self._frame_infos.get(frame_name) if self._frame_infos is not None else None
 
     def set_frame_info(self, frame_name: str, **kwargs: Any) -> None:
         frame_info = self.get_frame_info(frame_name)
@@ -55,9 +61,38 @@ class SeqInfo(DTO):
                 else:
                     super(SeqInfo, self).__setattr__(key, value)
         else:
-            frame_info = FrameInfo(frame_name, **kwargs)
+            if self._frame_infos is None:
+                self._frame_infos = {}
+
+            self._frame_infos[frame_name] = FrameInfo(frame_name, **kwargs)
+
+    def set_frame_infos(self, frame_names: Iterable[str], **kwargs: Any) -> None:
+        '''Sets `kwargs` on the info of every frame of `frame_names`, frames without info are added in order.'''
+        for frame_name in frame_names:
+            self.set_frame_info(frame_name, **kwargs)
+
+    def asdict(self) -> dict:
+        # Frame infos are indexed by name but are exported as the list of them
+        seq_info = {}
+
+        for key, value in super(SeqInfo, self).asdict().items():
+            if key == '_frame_infos':
+                key, value = 'frame_infos', list(value.values())
+
+            seq_info[key] = value
+
+        return seq_info
+
+    def merge(self, other: 'SeqInfo', fields: Iterable[str]) -> None:
+        '''Copies `fields` of `other` into this one, `frame_infos.<field>` are copied frame by frame.'''
+        for field in fields:
+            if field.startswith('frame_infos.'):
+                key = field.split('.', 1)[1]
 
-            if self.frame_infos is None:
-                self.frame_infos = []
+                for frame_info in other.frame_infos or []:
+                    value = getattr(frame_info, key)
 
-            self.frame_infos.append(frame_info)
+                    if value is not None:
+                        self.set_frame_info(frame_info.frame_name, **{key: value})
+            else:
+                setattr(self, field, getattr(other, field))
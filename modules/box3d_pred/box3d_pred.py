@@ -6,53 +6,89 @@ import numpy as np
 from abstract.stage import Stage
 from dto.pred.box3d import LiDARBox3D
 from dto.seq.seq_info import SeqInfo
-from utils.matrix import homo_mat, point_3d_transfrom
+from utils.instance_converter import bat3d_boxes_to_kitti
+from utils.transform_graph import TransformGraph
 
 
 class Box3DPred(Stage):
     def __init__(self, data_dir: str = 'velodyne', ret_labels: List[str] = None, thres_score: float = 0.5,
-                 **kwargs: Any):
+                 fov_test: str = 'center', **kwargs: Any):
+        '''
+            Args:
+                fov_test: 'center' keeps the boxes whose center projects inside the image, 'corners' keeps the boxes
+                    whose 8 corners are in front of the camera and whose projection overlaps the image.
+        '''
         super(Box3DPred, self).__init__(**kwargs)
+
+        if fov_test not in ('center', 'corners'):
+            raise ValueError(f'Unsupported fov_test {fov_test}.')
+
         self.data_dir = data_dir
         self.ret_labels = ret_labels
         self.thres_score = thres_score
+        self.fov_test = fov_test
 
     def preprocess(self, seq_info: SeqInfo) -> Tuple[SeqInfo, str]:
         data_dir = str(Path(seq_info.out_dir).joinpath(seq_info.seq_name, self.data_dir))
         return seq_info, data_dir
 
     def postprocess(self, seq_info: SeqInfo, frames: List[List[LiDARBox3D]]) -> Tuple[SeqInfo, List[List[LiDARBox3D]]]:
-        extrinsic = seq_info.extrinsic
+        transforms = seq_info.transforms
         intrinsic = seq_info.intrinsic
         image_size = seq_info.image_size
-        assert extrinsic is not None
+        assert transforms is not None
         assert intrinsic is not None
         assert image_size is not None
 
         for i, frame in enumerate(frames):
-            for lidar_box3d in frame:
-                if (self.ret_labels is not None and lidar_box3d.type not in self.ret_labels
-                    or (lidar_box3d.score is not None and lidar_box3d.score < self.thres_score)
-                        or not self.is_in_fov(lidar_box3d, image_size, extrinsic, intrinsic)):
-                    lidar_box3d.type = 'ignore'
-            frame = list(filter(lambda lidar_box3d: lidar_box3d.type != 'ignore', frame))
-            frames[i] = frame
+            if frame:
+                keep = self.get_keep_mask(frame, image_size, transforms, intrinsic)
+                frames[i] = [lidar_box3d for lidar_box3d, kept in zip(frame, keep.tolist()) if kept]
+
         return seq_info, frames
 
-    def is_in_fov(self, lidar_box3d: LiDARBox3D, image_size: Tuple[int, int],
-                  extrinsic: np.ndarray, intrinsic: np.ndarray) -> bool:
-        location = (lidar_box3d.x, lidar_box3d.y, lidar_box3d.z)
-        location = self.point_to_image(location, extrinsic, intrinsic)
-
-        return 0 < location[0] < image_size[0] and 0 < location[1] < image_size[1]
-
-    def point_to_image(self, location: Tuple[float, float, float], extrinsic: np.ndarray,
-                       intrinsic: np.ndarray) -> Tuple[int, int]:
-        points = np.array([location])
-        extrinsic = homo_mat(extrinsic)
-        intrinsic = homo_mat(intrinsic)
-        projection_mat = intrinsic @ extrinsic
-        projection_mat = projection_mat[:3]
-        points = point_3d_transfrom(points, projection_mat)
-        points /= points[:, 2:]
-        return (points[0][0], points[0][1])
+    def get_keep_mask(self, frame: List[LiDARBox3D], image_size: Tuple[int, int], transforms: TransformGraph,
+                      intrinsic: np.ndarray) -> np.ndarray:
+        '''Returns the (N,) mask of the boxes of `frame` with a returned label, a high enough score and in the FOV.'''
+        scores = np.array([lidar_box3d.score if lidar_box3d.score is not None else np.nan for lidar_box3d in frame])
+        keep = ~(scores < self.thres_score)  # boxes without score are kept
+
+        if self.ret_labels is not None:
+            keep &= np.isin([lidar_box3d.type for lidar_box3d in frame], self.ret_labels)
+
+        boxes = np.array([(lidar_box3d.x, lidar_box3d.y, lidar_box3d.z, lidar_box3d.x_size, lidar_box3d.y_size,
+                           lidar_box3d.z_size, lidar_box3d.rotation_y) for lidar_box3d in frame])
+
+        if self.fov_test == 'corners':
+            keep &= self.is_in_frustum(boxes, image_size, transforms, intrinsic)
+        else:
+            keep &= self.is_in_fov(boxes[:, :3], image_size, transforms.get('lidar', 'image'))
+
+        return keep
+
+    def is_in_fov(self, locations: np.ndarray, image_size: Tuple[int, int], projection_mat: np.ndarray) -> np.ndarray:
+        '''
+            Returns the (N,) mask of the (N, 3) `locations` which project inside the image.
+
+            Args:
+                projection_mat: (3, 4) lidar to image matrix, see `TransformGraph.get('lidar', 'image')`.
+        '''
+        points = self.point_to_image(locations, projection_mat)
+        return (0 < points[:, 0]) & (points[:, 0] < image_size[0]) & (0 < points[:, 1]) & (points[:, 1] < image_size[1])
+
+    def point_to_image(self, locations: np.ndarray, projection_mat: np.ndarray) -> np.ndarray:
+        points = locations @ projection_mat[:, :3].T + projection_mat[:, 3]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return points[:, :2] / points[:, 2:]
+
+    def is_in_frustum(self, boxes: np.ndarray, image_size: Tuple[int, int], transforms: TransformGraph,
+                      intrinsic: np.ndarray) -> np.ndarray:
+        '''
+            Returns the (N,) mask of the (N, 7) `boxes` (x, y, z, x_size, y_size, z_size, rotation_y) whose 8 corners
+            are in front of the camera and whose 2D box overlaps the image, i.e. which have a KITTI 2D box.
+        '''
+        kitti_boxes = bat3d_boxes_to_kitti(boxes[:, 3:6], boxes[:, :3], boxes[:, 6], transforms.get('lidar', 'camera'),
+                                           intrinsic, image_size)
+        left, top, right, bottom = kitti_boxes['bboxes'].T
+        return (left < right) & (top < bottom)
@@ -1,16 +1,20 @@
+from functools import partial
 from pathlib import Path
 from typing import Tuple
 
 import numpy as np
 
 from abstract.processor import Processor
-from dto.kitti.calib.calib import Calib
 from dto.kitti.calib.frame import Frame
 from dto.seq.seq_info import SeqInfo
 
 
 class CalibProcessor(Processor):
-    def __init__(self, calib_dir: str = 'calib', image_size: Tuple[int, int] = None, padding: bool = True) -> None:
+    shared = True
+
+    def __init__(self, calib_dir: str = 'calib', image_size: Tuple[int, int] = None, padding: bool = True,
+                 workers: int = 1, executor: str = 'thread') -> None:
+        super(CalibProcessor, self).__init__(workers, executor)
         self.calib_dir = calib_dir
         self.image_size = image_size
         self.padding = padding
@@ -28,7 +32,6 @@ class CalibProcessor(Processor):
 
         assert extrinsic.shape == (3, 4), extrinsic.shape
         assert intrinsic.shape == (3, 3), intrinsic.shape
-        P0 = P1 = P3 = Tr_imu_to_velo = np.identity(4)[:3]
         P2 = intrinsic
 
         if self.image_size is not None:
@@ -36,16 +39,19 @@ class CalibProcessor(Processor):
 
         seq_info.calib_intrinsic = P2
         P2 = np.pad(P2, ((0, 0), (0, 1)))
-        R0_rect = np.identity(3)
-        Tr_velo_to_cam = extrinsic
+        process_frame = partial(self.process_frame, out_dir=out_dir, P2=P2, Tr_velo_to_cam=extrinsic)
 
-        frames = [Frame(int(frame_name), P0, P1, P2, P3, R0_rect, Tr_velo_to_cam, Tr_imu_to_velo)
-                  for frame_name in frame_names]
-        calib = Calib(frames)
-        calib.tofile(out_dir)
+        for _ in self.map_frames(process_frame, frame_names):
+            pass
 
         return seq_info,
 
+    def process_frame(self, frame_name: str, out_dir: str, P2: np.ndarray, Tr_velo_to_cam: np.ndarray) -> None:
+        P0 = P1 = P3 = Tr_imu_to_velo = np.identity(4)[:3]
+        R0_rect = np.identity(3)
+        frame = Frame(int(frame_name), P0, P1, P2, P3, R0_rect, Tr_velo_to_cam, Tr_imu_to_velo)
+        frame.tofile(out_dir)
+
     def pad_resize(self, intrinsic: np.ndarray, org_image_size: Tuple[int, int]) -> np.ndarray:
         assert self.image_size is not None
         width, height = org_image_size
@@ -1,9 +1,7 @@
 from pathlib import Path
 from typing import Iterator, List, Tuple, Union
 
-import cv2
 import numpy as np
-from natsort import natsorted
 
 from abstract.adapter import InAdapter
 from dto.seq.seq_info import SeqInfo
@@ -11,6 +9,8 @@ from utils.common import get_file_with_stem
 
 
 class BAT3DInAdapter(InAdapter):
+    shared = True
+
     def __init__(self, image_dir: str = 'images/CAM_FRONT_LEFT', image_suffix: str = '.jpeg',
                  file_id: Union[int, list, tuple] = None):
         super(BAT3DInAdapter, self).__init__()
@@ -25,6 +25,9 @@ class BAT3DInAdapter(InAdapter):
         self.file_id = file_id
 
     def convert(self, stage_input: Tuple[SeqInfo]) -> Tuple[SeqInfo, List[str], List[str], Iterator[np.float32]]:
+        import cv2
+        from natsort import natsorted
+
         seq_info = stage_input[0]
         image_dir = Path(seq_info.seq_dir).joinpath(self.image_dir)
         frame_names = seq_info.frame_names
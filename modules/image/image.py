@@ -7,6 +7,10 @@ from dto.seq.seq_info import SeqInfo
 
 
 class Image(Stage):
+    reads = ('frame_names',)
+    open_writes = ('frame_names', 'frame_infos.image_file')
+    writes = ('frame_names', 'frame_infos.image_file', 'image_size', 'resized_image_size')
+
     def preprocess(self, seq_info: SeqInfo, frame_names: List[str], image_files: List[str],
                    images: Iterator[np.ndarray]) -> Tuple[SeqInfo, List[str], Iterator[np.ndarray]]:
         for frame_name, image_file in zip(frame_names, image_files):
@@ -1,39 +1,66 @@
+from functools import partial
 from pathlib import Path
-from typing import Iterator, List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
-import cv2
 import numpy as np
 
-from abstract.processor import Processor
+from abstract.processor import FrameStream, Processor
 from dto.kitti.image.frame import Frame
 from dto.seq.seq_info import SeqInfo
 
 
 class ImageProcessor(Processor):
-    def __init__(self, image_dir: str = 'image_2', image_size: Tuple[int, int] = None, padding: bool = True) -> None:
+    streamable = True
+    shared = True
+
+    def __init__(self, image_dir: Optional[str] = 'image_2', image_size: Tuple[int, int] = None, padding: bool = True,
+                 workers: int = 1, executor: str = 'thread') -> None:
+        super(ImageProcessor, self).__init__(workers, executor)
         self.image_dir = image_dir
         self.image_size = image_size
         self.padding = padding
 
     def process(self, seq_info: SeqInfo, frame_names: List[str], images: Iterator[np.ndarray]) -> Tuple[SeqInfo]:
-        out_dir = str(Path(seq_info.out_dir).joinpath(seq_info.seq_name, self.image_dir))
+        stream = self.open_stream(seq_info, frame_names, images)
+        return stream.close(self.map_frames)
+
+    def open_stream(self, seq_info: SeqInfo, frame_names: List[str], images: Iterator[np.ndarray]) -> FrameStream:
+        out_dir = None
+
+        if self.image_dir is not None:
+            out_dir = str(Path(seq_info.out_dir).joinpath(seq_info.seq_name, self.image_dir))
+
+        process_frame = partial(self.process_frame, out_dir=out_dir)
+        collect = partial(self.collect_image_size, seq_info)
+        return FrameStream(frame_names, images, process_frame, collect, (seq_info,))
 
-        for frame_name, image in zip(frame_names, images):
-            if seq_info.image_size is None:
-                seq_info.image_size = (image.shape[1], image.shape[0])
-            elif seq_info.image_size != image.shape[1::-1]:
-                raise RuntimeError(f'Sizes of images in {seq_info.seq_dir} are not the same.')
+    def collect_image_size(self, seq_info: SeqInfo, image_sizes: Tuple[Tuple[int, int], Tuple[int, int]]) -> None:
+        image_size, resized_image_size = image_sizes
 
-            if self.image_size is not None:
-                image = self.pad_resize(image)
+        if seq_info.image_size is None:
+            seq_info.image_size = image_size
+        elif seq_info.image_size != image_size:
+            raise RuntimeError(f'Sizes of images in {seq_info.seq_dir} are not the same.')
 
-            seq_info.resized_image_size = (image.shape[1], image.shape[0])
+        seq_info.resized_image_size = resized_image_size
+
+    def process_frame(self, frame_name: str, image: np.ndarray,
+                      out_dir: Optional[str]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        image_size = (image.shape[1], image.shape[0])
+
+        if self.image_size is not None:
+            image = self.pad_resize(image)
+
+        # Images are only measured when no output folder is set
+        if out_dir is not None:
             frame = Frame(int(frame_name), data=image)
             frame.tofile(out_dir)
 
-        return seq_info,
+        return image_size, (image.shape[1], image.shape[0])
 
     def pad_resize(self, image: np.ndarray) -> np.ndarray:
+        import cv2
+
         assert self.image_size is not None
 
         # resize
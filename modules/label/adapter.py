@@ -1,8 +1,6 @@
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-import cv2
-
 from abstract.adapter import InAdapter, OutAdapter
 from dto.bat3d.label import Label as BAT3DLabel
 from dto.box.box2d import Box2D
@@ -21,6 +19,8 @@ from utils.common import get_file_with_stem, open_file
 
 
 class BAT3DInAdapter(InAdapter):
+    shared = True
+
     def __init__(self, label_dir: str, label_stem: str):
         super(BAT3DInAdapter, self).__init__()
         self.label_dir = label_dir
@@ -39,6 +39,8 @@ class BAT3DInAdapter(InAdapter):
 
 
 class ScaleAIInAdapter(InAdapter):
+    shared = True
+
     def __init__(self, label_dir: str, label_stem: str):
         super(ScaleAIInAdapter, self).__init__()
         self.label_dir = label_dir
@@ -57,6 +59,8 @@ class ScaleAIInAdapter(InAdapter):
 
 
 class CVATInAdapter(InAdapter):
+    shared = True
+
     def __init__(self, label_dir: str, label_stem: str):
         super(CVATInAdapter, self).__init__()
         self.label_dir = label_dir
@@ -75,6 +79,7 @@ class CVATInAdapter(InAdapter):
 
 
 class COCOOutAdapter(OutAdapter):
+    shared = True
     label_filename = 'label.json'
 
     def __init__(self, classes_id: Dict[str, int], image_dir: str):
@@ -84,6 +89,8 @@ class COCOOutAdapter(OutAdapter):
 
     def convert(self, stage_input: Tuple[SeqInfo], stage_output: Tuple[SeqInfo, List[str], List[List[Box2D]]]) \
             -> Tuple[SeqInfo]:
+        import cv2
+
         seq_info, image_files, frames = stage_output
         out_dir = Path(seq_info.out_dir)
         image_dir = out_dir.joinpath(seq_info.seq_name, self.image_dir)
@@ -153,6 +160,8 @@ class COCOOutAdapter(OutAdapter):
 
 
 class YOLOOutAdapter(OutAdapter):
+    shared = True
+
     def __init__(self, classes_id: Dict[str, int]):
         super(YOLOOutAdapter, self).__init__()
         self.classes_id = classes_id
@@ -161,6 +170,8 @@ class YOLOOutAdapter(OutAdapter):
 
     def convert(self, stage_input: Tuple[SeqInfo], stage_output: Tuple[SeqInfo, List[str], List[List[Box2D]]]) \
             -> Tuple[SeqInfo]:
+        import cv2
+
         seq_info, image_files, frames = stage_output
         image_dir = Path(seq_info.out_dir).joinpath(seq_info.seq_name, self.image_dir)
         label_dir = Path(seq_info.out_dir).joinpath(seq_info.seq_name, self.label_dir)
@@ -189,7 +200,7 @@ class YOLOOutAdapter(OutAdapter):
 
 
 class Market1501OutAdapter(OutAdapter):
-    instance_ids: Dict[str, int] = {}
+    shared = True
 
     def __init__(self, classes_id: Dict[str, int], cams_id: Dict[str, int]):
         super(Market1501OutAdapter, self).__init__()
@@ -198,6 +209,8 @@ class Market1501OutAdapter(OutAdapter):
 
     def convert(self, stage_input: Tuple[SeqInfo], stage_output: Tuple[SeqInfo, List[str], List[List[Box2D]]]) \
             -> Tuple[SeqInfo]:
+        import cv2
+
         seq_info, image_files, frames = stage_output
         out_dir = Path(seq_info.out_dir)
 
@@ -210,13 +223,11 @@ class Market1501OutAdapter(OutAdapter):
                 cam_id = self.cams_id[cam_name]
 
                 for box in frame:
+                    # Instance folders are named after the instance instead of a process-wide counter, so that
+                    # sequences converted in different worker processes never collide. They are renumbered when
+                    # the dataset is split.
                     instance_dirname = f'{seq_name}_{box.type}_{box.track_id}'
-
-                    if instance_dirname not in Market1501OutAdapter.instance_ids:
-                        Market1501OutAdapter.instance_ids[instance_dirname] = len(Market1501OutAdapter.instance_ids) + 1
-
-                    instance_id = Market1501OutAdapter.instance_ids[instance_dirname]
-                    instance_file = out_dir.joinpath(f'{instance_id:04d}', f'{cam_id:04d}',
+                    instance_file = out_dir.joinpath(instance_dirname, f'{cam_id:04d}',
                                                      f'{seq_name}_{cam_name}_{image_name}.jpg')
                     instance_file.parent.mkdir(parents=True, exist_ok=True)
                     instance_img = image[box.top:box.bottom, box.left:box.right]
@@ -225,6 +236,8 @@ class Market1501OutAdapter(OutAdapter):
 
 
 class KITTIOutAdapter(OutAdapter):
+    shared = True
+
     def __init__(self, label_dir: str):
         super(KITTIOutAdapter, self).__init__()
         self.label_dir = label_dir
@@ -1,8 +1,6 @@
 from pathlib import Path
 from typing import Any, List, Tuple
 
-import cv2
-
 from abstract.processor import Processor
 from dto.bat3d.frame import Frame as BAT3DFrame
 from dto.bat3d.label import Label as BAT3DLabel
@@ -11,10 +9,13 @@ from dto.cvat.label import Label as CVATLabel
 from dto.scale_ai.label import Label as ScaleAILabel
 from dto.seq.seq_info import SeqInfo
 from utils.common import get_file_with_stem
-from utils.instance_converter import bat3d_to_kitti, scale_ai_to_bat3d
+from utils.instance_converter import (bat3d_instances_to_kitti,
+                                      scale_ai_to_bat3d)
 
 
 class LabelProcessor(Processor):
+    shared = True
+
     def __init__(self, image_dir: str, rm_thres: float, rm_box_ratio: float):
         super(LabelProcessor, self).__init__()
         self.image_dir = image_dir
@@ -22,6 +23,8 @@ class LabelProcessor(Processor):
         self.rm_box_ratio = rm_box_ratio
 
     def process(self, seq_info: SeqInfo, label: Any) -> Tuple[SeqInfo, List[str], List[List[Box2D]]]:
+        import cv2
+
         image_dir = Path(seq_info.seq_dir).joinpath(self.image_dir)
 
         image_files: List[str] = []
@@ -52,8 +55,7 @@ class LabelProcessor(Processor):
                     raise RuntimeError('image_file contains spaces.')
 
                 height, width, _ = cv2.imread(image_file).shape
-                kitti_instances = [bat3d_to_kitti(instance, extrinsic, intrinsic, (width, height))
-                                   for instance in bat3d_frame.instances]
+                kitti_instances = bat3d_instances_to_kitti(bat3d_frame.instances, extrinsic, intrinsic, (width, height))
 
                 # Sort by distance from camera
                 kitti_instances.sort(key=lambda instance: instance.location[2], reverse=True)
@@ -7,10 +7,13 @@ from dto.kitti.label.frame import Frame as KITTIFrame
 from dto.kitti.label.label import Label as KITTILabel
 from dto.scale_ai.label import Label as ScaleAILabel
 from dto.seq.seq_info import SeqInfo
-from utils.instance_converter import bat3d_to_kitti, scale_ai_to_bat3d
+from utils.instance_converter import (bat3d_instances_to_kitti,
+                                      scale_ai_to_bat3d)
 
 
 class LabelProcessor(Processor):
+    shared = True
+
     def __init__(self, image_size: Tuple[int, int] = None, padding: bool = False):
         super(LabelProcessor, self).__init__()
         self.image_size = image_size
@@ -35,8 +38,7 @@ class LabelProcessor(Processor):
             label = BAT3DLabel(bat3d_frames)
 
         for bat3d_frame in label.frames:
-            kitti_instances = [bat3d_to_kitti(instance, extrinsic, intrinsic, image_size)
-                               for instance in bat3d_frame.instances]
+            kitti_instances = bat3d_instances_to_kitti(bat3d_frame.instances, extrinsic, intrinsic, image_size)
             kitti_frame = KITTIFrame(bat3d_frame.frame_id, kitti_instances)
             kitti_frames.append(kitti_frame)
         kitti_label = KITTILabel(kitti_frames)
@@ -9,6 +9,8 @@ from utils.output_rig import get_extrinsic_matrices, get_intrinsic_matrices
 
 
 class BAT3DInAdapter(InAdapter):
+    shared = True
+
     def __init__(self, out_rig_stem: str = 'output-rig-*', cam_name: str = 'cameraMainFov60'):
         super(BAT3DInAdapter, self).__init__()
         self.out_rig_stem = out_rig_stem
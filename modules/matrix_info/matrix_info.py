@@ -1,14 +1,17 @@
 from typing import Tuple
 
 import numpy as np
-from scipy.spatial.transform import Rotation as R
 
 from abstract.stage import Stage
 from dto.seq.seq_info import SeqInfo
-from utils.matrix import homo_mat, inv_mat
+from utils.transform_graph import TransformGraph
 
 
 class MatrixInfo(Stage):
+    reads = ()
+    writes = ('extrinsic', 'intrinsic', 'calib_extrinsic', 'calib_intrinsic', 'calib_file', 'bin_pc_transform_matrix',
+              'transforms')
+
     def preprocess(self, seq_info: SeqInfo, calib_file: str, extrinsic: np.ndarray,
                    intrinsic: np.ndarray) -> Tuple[SeqInfo]:
         seq_info.extrinsic = extrinsic
@@ -24,13 +27,18 @@ class MatrixInfo(Stage):
         kitti_velo_to_cam = self.kitti_velo_to_cam_matrix(extrinsic)
         seq_info.calib_extrinsic = kitti_velo_to_cam
 
-        bin_pc_transform_matrix = inv_mat(kitti_velo_to_cam, ret_homo=True) @ homo_mat(extrinsic)
-        bin_pc_transform_matrix = bin_pc_transform_matrix[:3]
+        transforms = TransformGraph()
+        transforms.add('lidar', 'camera', extrinsic)
+        transforms.add('kitti_velo', 'camera', kitti_velo_to_cam)
+        transforms.add('camera', 'image', intrinsic, invertible=False)
+        seq_info.transforms = transforms
 
-        seq_info.bin_pc_transform_matrix = bin_pc_transform_matrix
+        seq_info.bin_pc_transform_matrix = transforms.get('lidar', 'kitti_velo')
         return seq_info,
 
     def kitti_velo_to_cam_rotation_matrix(self) -> np.ndarray:
+        from scipy.spatial.transform import Rotation as R
+
         Rn = R.from_euler('ZYX', [np.pi / 2, -np.pi / 2, 0]).as_matrix()
         Rn = np.pad(Rn, ((0, 0), (0, 1)))
         assert Rn.shape == (3, 4)
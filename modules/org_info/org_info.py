@@ -2,4 +2,5 @@ from abstract.stage import Stage
 
 
 class OrgInfo(Stage):
-    pass
+    reads = ('frame_infos',)
+    writes = ()
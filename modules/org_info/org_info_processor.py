@@ -7,6 +7,8 @@ from utils.common import open_file
 
 
 class OrgInfoProcessor(Processor):
+    shared = True
+
     def __init__(self, org_info_dir: str = 'org_info') -> None:
         self.org_info_dir = org_info_dir
 
@@ -10,6 +10,8 @@ from utils.instance_converter import lidar_box3d_to_bat3d
 
 
 class BAT3DProcessor(Processor):
+    shared = True
+
     def __init__(self, label_dir: str = 'annotations/LIDAR_TOP', prelabel_attr: bool = False):
         super(BAT3DProcessor, self).__init__()
         self.label_dir = label_dir
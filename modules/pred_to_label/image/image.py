@@ -1,24 +1,27 @@
 from pathlib import Path
 from typing import List, Tuple
 
-import cv2
 import numpy as np
 
 from abstract.processor import Processor
 from dto.kitti.label.frame import Frame as KITTIFrame
 from dto.pred.box3d import LiDARBox3D
 from dto.seq.seq_info import SeqInfo
-from utils.instance_converter import lidar_box3d_to_kitti
-from utils.kitti import compute_box_3d
+from utils.instance_converter import lidar_boxes3d_to_kitti
+from utils.kitti import compute_box_3d_batch
 from utils.matrix import homo_mat
 
 
 class ImageProcessor(Processor):
+    shared = True
+
     def __init__(self, image_dir: str = 'image'):
         super(ImageProcessor, self).__init__()
         self.image_dir = image_dir
 
     def process(self, seq_info: SeqInfo, frames: List[List[LiDARBox3D]]) -> Tuple[SeqInfo]:
+        import cv2
+
         out_dir = Path(seq_info.out_dir).joinpath(seq_info.seq_name, self.image_dir)
         out_dir.mkdir(parents=True, exist_ok=True)
         extrinsic = seq_info.extrinsic
@@ -35,14 +38,15 @@ class ImageProcessor(Processor):
                 if frame_info.image_file is not None:
                     image = cv2.imread(frame_info.image_file)
 
-                kitti_instances = [lidar_box3d_to_kitti(lidar_box3d, extrinsic, intrinsic, image.shape[1::-1])
-                                   for lidar_box3d in frame]
+                kitti_instances = lidar_boxes3d_to_kitti(frame, extrinsic, intrinsic, (image.shape[1], image.shape[0]))
                 kitti_frame = KITTIFrame(int(frame_name), kitti_instances)
                 self.visualize(image, kitti_frame, intrinsic, str(out_dir))
 
         return seq_info,
 
     def visualize(self, image: np.ndarray, kitti_frame: KITTIFrame, intrinsic: np.ndarray, out_dir: str) -> None:
+        import cv2
+
         image_box2d = image.copy()
         image_box3d = image.copy()
 
@@ -50,12 +54,14 @@ class ImageProcessor(Processor):
             left, top, right, bottom = kitti_instance.bbox
             image_box2d = cv2.rectangle(image_box2d, (left, top), (right, bottom), (0, 255, 0), thickness=2)
 
-            height, width, length = kitti_instance.dimensions
-            location = kitti_instance.location
-            rotation_y = kitti_instance.rotation_y
-            bbox_8points, _ = compute_box_3d(width, height, length, location, rotation_y, homo_mat(intrinsic))
+        if kitti_frame.instances:
+            dimensions = np.array([kitti_instance.dimensions for kitti_instance in kitti_frame.instances])
+            locations = np.array([kitti_instance.location for kitti_instance in kitti_frame.instances])
+            rotations = np.array([kitti_instance.rotation_y for kitti_instance in kitti_frame.instances])
+            corners_2d, _, valid = compute_box_3d_batch(dimensions[:, 1], dimensions[:, 0], dimensions[:, 2],
+                                                        locations, rotations, homo_mat(intrinsic))
 
-            if bbox_8points is not None:
+            for bbox_8points in corners_2d[valid]:
                 image_box3d = self.draw_projected_box3d(image_box3d, bbox_8points, color=(0, 255, 0), thickness=2)
 
         cv2.imwrite(str(Path(out_dir).joinpath(f'{kitti_frame.name}_2d_box.jpg')), image_box2d)
@@ -73,6 +79,8 @@ class ImageProcessor(Processor):
               |/         |/
               6 -------- 7
         """
+        import cv2
+
         qs = qs.astype(np.int32)
         for k in range(0, 4):
             # Ref: http://docs.enthought.com/mayavi/mayavi/auto/mlab_helper_functions.html
@@ -6,10 +6,12 @@ from dto.kitti.label.frame import Frame as KITTIFrame
 from dto.kitti.label.label import Label as KITTILabel
 from dto.pred.box3d import LiDARBox3D
 from dto.seq.seq_info import SeqInfo
-from utils.instance_converter import lidar_box3d_to_kitti
+from utils.instance_converter import lidar_boxes3d_to_kitti
 
 
 class KITTIProcessor(Processor):
+    shared = True
+
     def __init__(self, label_dir: str = 'label_2'):
         super(KITTIProcessor, self).__init__()
         self.label_dir = label_dir
@@ -27,8 +29,7 @@ class KITTIProcessor(Processor):
 
         kitti_frames = []
         for frame_name, frame in zip(frame_names, frames):
-            kitti_instances = [lidar_box3d_to_kitti(lidar_box3d, extrinsic, intrinsic, image_size)
-                               for lidar_box3d in frame]
+            kitti_instances = lidar_boxes3d_to_kitti(frame, extrinsic, intrinsic, image_size)
             kitti_frame = KITTIFrame(int(frame_name), kitti_instances)
             kitti_frames.append(kitti_frame)
         label_2 = KITTILabel(kitti_frames)
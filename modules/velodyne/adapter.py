@@ -2,20 +2,26 @@ from pathlib import Path
 from typing import Iterator, List, Optional, Tuple, Union
 
 import numpy as np
-from natsort import natsorted
-from pyntcloud import PyntCloud
 
 from abstract.adapter import InAdapter
 from dto.seq.seq_info import SeqInfo
 from utils.common import get_file_with_stem
+from utils.pcd import read_pcd
 
 
 class BAT3DInAdapter(InAdapter):
+    shared = True
+
     def __init__(self, pcd_dirs: List[str] = ['pointclouds_org'], pcd_suffix: str = '.pcd',
-                 file_id: Union[int, list, tuple] = None) -> None:
+                 file_id: Union[int, list, tuple] = None, pcd_fields: Optional[List[str]] = None) -> None:
+        '''
+            Args:
+                pcd_fields: Fields of the point clouds to read, e.g. ['x', 'y', 'z', 'intensity'], all if None.
+        '''
         super(BAT3DInAdapter, self).__init__()
         self.pcd_dirs = pcd_dirs
         self.pcd_suffix = pcd_suffix
+        self.pcd_fields = pcd_fields
 
         if isinstance(file_id, int):
             file_id = [file_id]
@@ -25,6 +31,8 @@ class BAT3DInAdapter(InAdapter):
         self.file_id = file_id
 
     def convert(self, stage_input: Tuple) -> Tuple[SeqInfo, List[str], List[str], Iterator[np.ndarray]]:
+        from natsort import natsorted
+
         seq_info = stage_input[0]
         frame_names = seq_info.frame_names
 
@@ -59,5 +67,5 @@ class BAT3DInAdapter(InAdapter):
             frame_names = [frame_name for frame_name in frame_names if frame_name]
 
         seq_info.frame_names = frame_names
-        point_clouds = (PyntCloud.from_file(str(pcd_file)).points.values for pcd_file in pcd_files)
+        point_clouds = (read_pcd(pcd_file, self.pcd_fields) for pcd_file in pcd_files)
         return seq_info, frame_names, pcd_files, point_clouds
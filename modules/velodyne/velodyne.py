@@ -1,4 +1,4 @@
-from typing import Iterator, List, Tuple
+from typing import Any, Iterator, List, Tuple
 
 import numpy as np
 
@@ -7,6 +7,18 @@ from dto.seq.seq_info import SeqInfo
 
 
 class Velodyne(Stage):
+    reads: Tuple[str, ...] = ('frame_names', 'bin_pc_transform_matrix')
+    open_writes = ('frame_names', 'frame_infos.pcd_file')
+    writes = ('frame_names', 'frame_infos.pcd_file')
+
+    def __init__(self, **kwargs: Any):
+        super(Velodyne, self).__init__(**kwargs)
+
+        # The image fov crop projects the points with the transforms of the sequence into the image size set by the
+        # Image stage, other modes only read the transform matrix of the point clouds
+        if getattr(self.processor, 'image_fov', False):
+            self.reads = self.reads + ('transforms', 'image_size')
+
     def preprocess(self, seq_info: SeqInfo, frame_names: List[str], pcd_files: List[str],
                    point_clouds: Iterator[np.ndarray]) -> Tuple[SeqInfo, List[str], Iterator[np.ndarray]]:
         for frame_name, pcd_file in zip(frame_names, pcd_files):
@@ -1,35 +1,105 @@
+from functools import partial
 from pathlib import Path
-from typing import Iterator, List, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
-from abstract.processor import Processor
+from abstract.processor import FrameStream, Processor
 from dto.kitti.velodyne.frame import Frame
 from dto.seq.seq_info import SeqInfo
-from utils.matrix import point_3d_transfrom
+from utils.matrix import affine_transform
+from utils.point_cloud import (COMPRESSIONS, crop_image, crop_range,
+                               voxel_downsample)
 
 
 class VelodyneProcessor(Processor):
-    def __init__(self, velodyne_dir: str = 'velodyne', n_feature: int = 4) -> None:
+    streamable = True
+    shared = True
+
+    def __init__(self, velodyne_dir: str = 'velodyne', n_feature: int = 4, image_fov: bool = False,
+                 fov_margin: float = 0, point_cloud_range: Optional[List[float]] = None,
+                 voxel_size: Optional[Union[float, Sequence[float]]] = None, voxel_reduce: str = 'mean',
+                 compression: Optional[str] = None, workers: int = 1, executor: str = 'thread') -> None:
+        '''
+            Args:
+                image_fov: Whether to keep only the points in front of the camera which project inside the image,
+                    with the extrinsic and intrinsic of the sequence. The image size is set by the Image stage, which
+                    must come before the Velodyne stage in the config.
+                fov_margin: Pixels the image bounds are extended with for `image_fov`.
+                point_cloud_range: x_min, y_min, z_min, x_max, y_max and z_max in the frame of the output point
+                    clouds, points outside are dropped. No crop if None.
+                voxel_size: Size of the voxels the point clouds are downsampled with, after the crop. No
+                    downsampling if None.
+                voxel_reduce: 'mean' or 'first', see `utils.point_cloud.voxel_downsample`.
+                compression: 'quantized', 'zlib' or 'lzma' to write the compact format of
+                    `utils.point_cloud.encode_compact` instead of raw float32 .bin files, which KITTI tools can not
+                    read. `dto.kitti.velodyne.frame.Frame` reads both.
+        '''
+        super(VelodyneProcessor, self).__init__(workers, executor)
         self.velodyne_dir = velodyne_dir
         self.n_feature = n_feature  # number of features of a point, e.g (x, y, z, intensity)
+        self.image_fov = image_fov
+        self.fov_margin = fov_margin
+        self.point_cloud_range = point_cloud_range
+        self.voxel_size = voxel_size
+        self.voxel_reduce = voxel_reduce
+        self.compression = compression
+
+        if voxel_reduce not in ('mean', 'first'):
+            raise ValueError(f'Unsupported voxel reduction {voxel_reduce}.')
+
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f'Unsupported compression {compression}, expected one of {COMPRESSIONS}.')
 
     def process(self, seq_info: SeqInfo, frame_names: List[str], point_clouds: Iterator[np.ndarray]) -> Tuple[SeqInfo]:
+        stream = self.open_stream(seq_info, frame_names, point_clouds)
+        return stream.close(self.map_frames)
+
+    def open_stream(self, seq_info: SeqInfo, frame_names: List[str],
+                    point_clouds: Iterator[np.ndarray]) -> FrameStream:
         out_dir = str(Path(seq_info.out_dir).joinpath(seq_info.seq_name, self.velodyne_dir))
 
         assert isinstance(seq_info.bin_pc_transform_matrix, np.ndarray)
         assert seq_info.bin_pc_transform_matrix.shape == (3, 4)
         bin_pc_transform_matrix = seq_info.bin_pc_transform_matrix
+        process_frame = partial(self.process_frame, out_dir=out_dir, bin_pc_transform_matrix=bin_pc_transform_matrix,
+                                seq_info=seq_info if self.image_fov else None)
+        return FrameStream(frame_names, point_clouds, process_frame, output=(seq_info,))
+
+    def process_frame(self, frame_name: str, point_cloud: np.ndarray, out_dir: str, bin_pc_transform_matrix: np.ndarray,
+                      seq_info: Optional[SeqInfo] = None) -> None:
+        point_cloud = self.process_pcd(point_cloud, bin_pc_transform_matrix)
+
+        if self.image_fov:
+            assert seq_info is not None
 
-        for frame_name, point_cloud in zip(frame_names, point_clouds):
-            point_cloud = self.process_pcd(point_cloud, bin_pc_transform_matrix)
-            assert point_cloud.dtype == np.float32, point_cloud.dtype
-            frame = Frame(int(frame_name), data=point_cloud)
-            frame.tofile(out_dir)
+            if seq_info.transforms is None:
+                raise RuntimeError('Transforms are not set, the MatrixInfo stage must come before the Velodyne stage.')
 
-        return seq_info,
+            # The image size is read per frame, in streaming execution it is only set once the Image stage has
+            # processed the first frame
+            if seq_info.image_size is None:
+                raise RuntimeError('Image size is not set, the Image stage must come before the Velodyne stage.')
+
+            point_cloud = crop_image(point_cloud, seq_info.transforms.get('kitti_velo', 'image'), seq_info.image_size,
+                                     self.fov_margin)
+
+        point_cloud = self.reduce_pcd(point_cloud)
+        assert point_cloud.dtype == np.float32, point_cloud.dtype
+        frame = Frame(int(frame_name), data=point_cloud, compression=self.compression)
+        frame.tofile(out_dir)
 
     def process_pcd(self, point_cloud: np.ndarray, bin_pc_transform_matrix: np.ndarray) -> np.ndarray:
-        point_cloud = point_cloud[:, :self.n_feature].astype(np.float32)
-        point_cloud[:, :3] = point_3d_transfrom(point_cloud[:, :3], bin_pc_transform_matrix)
+        # The array of the in adapter is left untouched, the transform writes straight into a new one
+        point_cloud = point_cloud[:, :self.n_feature].astype(np.float32, copy=False)
+        out = np.empty(point_cloud.shape, dtype=np.float32)
+        return affine_transform(point_cloud, bin_pc_transform_matrix, out=out)
+
+    def reduce_pcd(self, point_cloud: np.ndarray) -> np.ndarray:
+        if self.point_cloud_range is not None:
+            point_cloud = crop_range(point_cloud, self.point_cloud_range)
+
+        if self.voxel_size is not None:
+            point_cloud = voxel_downsample(point_cloud, self.voxel_size, self.voxel_reduce)
+
         return point_cloud
@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from natsort import natsorted
+
+sys.path.append(os.getcwd())
+
+from converter import EXECUTIONS  # noqa: E402
+from utils.benchmark import format_report, run_benchmark  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('config')
+    parser.add_argument('out_dir')
+    parser.add_argument('seq_dirs', nargs='+',
+                        help='Sequence folders, or delivery folders whose sub-folders are the sequences.')
+
+    parser.add_argument('--repeats', '-n', type=int, default=3)
+    parser.add_argument('--execution', choices=EXECUTIONS, default='sequential')
+    parser.add_argument('--json', help='File to write the report to.')
+
+    args = parser.parse_args()
+    return args
+
+
+def glob_seq_dirs(args):
+    seq_dirs = []
+
+    for seq_dir in map(Path, args.seq_dirs):
+        if seq_dir.joinpath('pointclouds_org').is_dir():
+            seq_dirs.append(seq_dir)
+        else:
+            seq_dirs += [sub_dir for sub_dir in natsorted(seq_dir.glob('*'))
+                         if sub_dir.is_dir() and not sub_dir.name.startswith('.')]
+
+    return seq_dirs
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    seq_dirs = glob_seq_dirs(args)
+
+    report = run_benchmark(args.config, [str(seq_dir) for seq_dir in seq_dirs], args.out_dir, args.repeats,
+                           args.execution)
+    print(format_report(report))
+
+    if args.json:
+        report.tofile(args.json)
@@ -0,0 +1,43 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.getcwd())
+
+from dto.benchmark.report import KernelReport  # noqa: E402
+from utils.kernel_bench import (KERNELS, compare_timings,  # noqa: E402
+                                format_timings, run_kernels)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--kernels', '-k', nargs='*', choices=list(KERNELS))
+    parser.add_argument('--max-size', type=int, help='Skip the sizes larger than this.')
+    parser.add_argument('--repeats', '-n', type=int, default=3)
+
+    parser.add_argument('--baseline', help='Report to compare with, kernels slower than --threshold times fail.')
+    parser.add_argument('--threshold', type=float, default=1.3)
+    parser.add_argument('--save', help='File to write the report to, e.g. to be used as --baseline later.')
+
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    timings = run_kernels(args.kernels, args.max_size, args.repeats)
+
+    baseline = KernelReport.fromfile(args.baseline) if args.baseline else None
+    baseline_timings = baseline.timings if baseline is not None else {}
+    print(format_timings(timings, baseline_timings))
+
+    if args.save:
+        KernelReport(timings, datetime.now().isoformat(timespec='seconds')).tofile(args.save)
+
+    regressions = compare_timings(timings, baseline_timings, args.threshold)
+
+    for key, baseline_timing, timing in regressions:
+        print(f'{key} regressed from {baseline_timing * 1e3:.3f} ms to {timing * 1e3:.3f} ms')
+
+    sys.exit(1 if regressions else 0)
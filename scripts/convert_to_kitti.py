@@ -2,19 +2,18 @@ import argparse
 import os
 import shutil
 import sys
-import traceback
 from collections import defaultdict
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from natsort import natsorted
-from tqdm import tqdm
 
 sys.path.append(os.getcwd())
 
-from converter import Converter  # noqa: E402
-from utils.common import open_file  # noqa: E402
+from dto.seq.manifest import Manifest  # noqa: E402
+from utils.config import CfgNode  # noqa: E402
+from utils.runner import (add_runner_args, get_runner_kwargs,  # noqa: E402
+                          run_converter)
 
 kitti_dirs = ['ImageSets', 'training', 'testing']
 cnt: Dict[str, int] = defaultdict(int)
@@ -37,8 +36,9 @@ def get_all_frames(seq_dirs: List[Path], data_dirs: Dict[str, str]) -> List[Dict
 
 
 def mv_data(frames: List[Dict[str, Path]], out_dir: str, train_ratio: float,
-            data_dirs: Dict[str, str]) -> Dict[str, List[str]]:
+            data_dirs: Dict[str, str]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
     frame_names = defaultdict(list)
+    outputs = defaultdict(list)  # seq_name -> moved files, relative to out_dir
     out_dir = Path(out_dir)
 
     train_split = frames[:round(train_ratio * len(frames))]
@@ -64,13 +64,43 @@ def mv_data(frames: List[Dict[str, Path]], out_dir: str, train_ratio: float,
                 src = data_file
                 dst = split_dir.joinpath(data_dirname, frame_name).with_suffix(data_file.suffix)
                 shutil.move(str(src), str(dst))
+                outputs[src.parents[1].name].append(dst.relative_to(out_dir).as_posix())
 
             cnt[split_name] += 1
             frame_names[split_name].append(frame_name)
 
+    return frame_names, outputs
+
+
+def init_cnt(out_dir: str, data_dirs: Dict[str, str]) -> None:
+    # Frames of previous runs are kept, new frames are numbered after them
+    for split_name in ['training', 'testing']:
+        for data_dirname, file_suffix in data_dirs.items():
+            for data_file in Path(out_dir).joinpath(split_name, data_dirname).glob(f'*{file_suffix}'):
+                cnt[split_name] = max(cnt[split_name], int(data_file.stem) + 1)
+
+
+def get_organized_frame_names(out_dir: str, data_dirs: Dict[str, str]) -> Dict[str, List[str]]:
+    frame_names = {}
+
+    for split_name in ['training', 'testing']:
+        frames_in_split = get_all_frames([Path(out_dir).joinpath(split_name)], data_dirs)
+        frame_names[split_name] = [next(iter(frame.values())).stem for frame in frames_in_split]
+
     return frame_names
 
 
+def update_manifests(outputs: Dict[str, List[str]], out_dir: str) -> None:
+    # Organized files replace the outputs of the sequences, they are removed if a sequence is converted again
+    for seq_name, seq_outputs in outputs.items():
+        manifest_file = str(Manifest.get_file(out_dir, seq_name))
+        manifest = Manifest.fromfile(manifest_file)
+
+        if manifest is not None:
+            manifest.outputs = seq_outputs
+            manifest.tofile(manifest_file)
+
+
 def rm_seq_dirs(seq_dirs: List[Path]) -> None:
     for seq_dir in seq_dirs:
         shutil.rmtree(str(seq_dir))
@@ -110,6 +140,7 @@ def parse_args():
     parser.add_argument('--train-ratio', type=float, default=0.8)
     parser.add_argument('--val-ratio-in-train', type=float, default=0.2)
     parser.add_argument('--not-organize-dir', '-no', action='store_true')
+    add_runner_args(parser, incremental=True)
     args = parser.parse_args()
 
     # Check args
@@ -155,22 +186,25 @@ if __name__ == '__main__':
 
     # Convert data
     out_dir = Path(args.out_dir)
-    converter = Converter(args.config)
-    data_dirs = converter.stages.pop('data_dirs', None)
+    # Only the data folders are read, the stages are built by the workers
+    data_dirs = CfgNode.load_yaml_with_base(args.config).eval_key('data_dirs')
 
-    for seq_dir in tqdm(seq_dirs):
-        try:
-            converter(str(seq_dir), args.out_dir)
-        except Exception as e:
-            with open_file('log.txt', mode='a', encoding='utf-8') as f:
-                f.write(f'{datetime.now()}: Error while converting {seq_dir}, {e}\n')
-                f.write(f'{traceback.format_exc()}\n')
+    run_converter(args.config, [str(seq_dir) for seq_dir in seq_dirs], args.out_dir, **get_runner_kwargs(args))
 
+    # Hidden folders hold the manifests of the incremental conversion
     seq_dirs = [seq_dir for seq_dir in natsorted(out_dir.glob('*'))
-                if seq_dir.is_dir() and seq_dir.stem not in kitti_dirs]
+                if seq_dir.is_dir() and seq_dir.stem not in kitti_dirs and not seq_dir.name.startswith('.')]
 
     if not args.not_organize_dir and seq_dirs and data_dirs:
+        if args.incremental:
+            init_cnt(str(out_dir), data_dirs)
+
         frames = get_all_frames(seq_dirs, data_dirs)
-        frame_names = mv_data(frames, str(out_dir), args.train_ratio, data_dirs)
+        frame_names, outputs = mv_data(frames, str(out_dir), args.train_ratio, data_dirs)
         rm_seq_dirs(seq_dirs)
+
+        if args.incremental:
+            update_manifests(outputs, str(out_dir))
+            frame_names = get_organized_frame_names(str(out_dir), data_dirs)
+
         mk_image_sets(frame_names, str(out_dir), args.val_ratio_in_train)
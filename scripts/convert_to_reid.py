@@ -2,17 +2,14 @@ import argparse
 import os
 import shutil
 import sys
-import traceback
-from datetime import datetime
 from pathlib import Path
 
 from natsort import natsorted
-from tqdm import tqdm
 
 sys.path.append(os.getcwd())
 
-from converter import Converter  # noqa: E402
-from utils.common import open_file  # noqa: E402
+from utils.runner import (add_runner_args, get_runner_kwargs,  # noqa: E402
+                          run_converter)
 
 
 def parse_args():
@@ -30,6 +27,7 @@ def parse_args():
     parser.add_argument('--val-ratio-in-train', type=float, default=0.2)
     parser.add_argument('--num-of-instances', type=int, default=5)
 
+    add_runner_args(parser)
     args = parser.parse_args()
 
     # Check args
@@ -79,17 +77,9 @@ if __name__ == '__main__':
     if len(list(out_dir.glob('*'))):
         raise RuntimeError('out_dir is not empty.')
 
-    converter = Converter(args.config)
+    run_converter(args.config, [str(seq_dir) for seq_dir in seq_dirs], args.out_dir, **get_runner_kwargs(args))
 
-    for seq_dir in tqdm(seq_dirs):
-        try:
-            converter(str(seq_dir), args.out_dir)
-        except Exception as e:
-            with open_file('log.txt', mode='a', encoding='utf-8') as f:
-                f.write(f'{datetime.now()}: Error while converting {seq_dir}, {e}\n')
-                f.write(f'{traceback.format_exc()}\n')
-
-    instances = [dir_ for dir_ in out_dir.glob('*')]
+    instances = [dir_ for dir_ in out_dir.glob('*') if not dir_.name.startswith('.')]
     train_split = instances[:round(len(instances) * args.train_ratio)]
     test_split = instances[round(len(instances) * args.train_ratio):]
     val_split = train_split[round(len(train_split) * (1.0 - args.val_ratio_in_train)):]
@@ -116,5 +106,5 @@ if __name__ == '__main__':
                 instance_cnt += 1
 
     for dir_ in out_dir.glob('*'):
-        if dir_.name not in split_map:
+        if dir_.name not in split_map and not dir_.name.startswith('.'):
             shutil.rmtree(str(dir_))
@@ -0,0 +1,32 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from utils.synthetic import make_delivery  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('root_dir')
+
+    parser.add_argument('--seqs', type=int, default=2)
+    parser.add_argument('--frames', type=int, default=10)
+    parser.add_argument('--points', type=int, default=120000)
+    parser.add_argument('--instances', type=int, default=10)
+    parser.add_argument('--image-size', type=int, nargs=2, default=(1280, 720), metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--pcd-data', choices=('binary', 'ascii', 'binary_compressed'), default='binary')
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    seq_dirs = make_delivery(args.root_dir, args.seqs, args.seed, n_frames=args.frames, n_points=args.points,
+                             n_instances=args.instances, image_size=tuple(args.image_size), pcd_data=args.pcd_data)
+
+    for seq_dir in seq_dirs:
+        print(seq_dir)
@@ -1,17 +1,14 @@
 import argparse
 import os
 import sys
-import traceback
-from datetime import datetime
 from pathlib import Path
 
 from natsort import natsorted
-from tqdm import tqdm
 
 sys.path.append(os.getcwd())
 
-from converter import Converter  # noqa: E402
-from utils.common import open_file  # noqa: E402
+from utils.runner import (add_runner_args, get_runner_kwargs,  # noqa: E402
+                          run_converter)
 
 
 def parse_args():
@@ -25,6 +22,7 @@ def parse_args():
     parser.add_argument('--seq-from', '-sf', type=int)
     parser.add_argument('--seq-to', '-st', type=int)
 
+    add_runner_args(parser, incremental=True)
     args = parser.parse_args()
 
     # Check args
@@ -70,12 +68,4 @@ if __name__ == '__main__':
 
     # Convert data
     out_dir = Path(args.out_dir)
-    converter = Converter(args.config)
-
-    for seq_dir in tqdm(seq_dirs):
-        try:
-            converter(str(seq_dir), args.out_dir)
-        except Exception as e:
-            with open_file('log.txt', mode='a', encoding='utf-8') as f:
-                f.write(f'{datetime.now()}: Error while converting {seq_dir}, {e}\n')
-                f.write(f'{traceback.format_exc()}\n')
+    run_converter(args.config, [str(seq_dir) for seq_dir in seq_dirs], args.out_dir, **get_runner_kwargs(args))
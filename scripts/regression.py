@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+from converter import EXECUTIONS  # noqa: E402
+from utils.regression import (GOLDEN_DIR, benchmark_config,  # noqa: E402
+                              check_budget, compare_dirs, compare_outputs,
+                              convert, load_budgets, make_dataset,
+                              update_goldens)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Converts a fixed synthetic dataset with every config of regression/budgets.yaml and checks the '
+                    'outputs against regression/goldens, the outputs of every other execution against them and the '
+                    'wall time and memory against the budgets.')
+    parser.add_argument('--configs', '-c', nargs='*', help='Config names, e.g. bat3d_to_kitti, default all.')
+    parser.add_argument('--work-dir', help='Folder for the dataset and the outputs, default a temporary one.')
+    parser.add_argument('--update-goldens', action='store_true',
+                        help='Replace the goldens with the outputs instead of comparing them.')
+    parser.add_argument('--skip-budgets', action='store_true')
+
+    args = parser.parse_args()
+    return args
+
+
+def run(args: argparse.Namespace, work_dir: Path) -> bool:
+    budgets = load_budgets()
+    config_names = args.configs or list(budgets)
+    data_dir = str(work_dir.joinpath('data'))
+    seq_dirs = make_dataset(data_dir)
+    passed = True
+
+    for config_name in config_names:
+        config_path = f'configs/{config_name}.yaml'
+        out_dir = work_dir.joinpath('out', config_name)
+        report = benchmark_config(config_path, seq_dirs, str(out_dir))
+        golden_dir = GOLDEN_DIR.joinpath(config_name)
+
+        if args.update_goldens:
+            update_goldens(golden_dir, out_dir, data_dir)
+            errors = []
+        else:
+            errors = compare_dirs(golden_dir, out_dir, data_dir)
+
+        # Executions only change how stages are scheduled, their outputs must be identical
+        for execution in EXECUTIONS:
+            if execution != report.execution:
+                execution_dir = work_dir.joinpath('executions', execution, config_name)
+                convert(config_path, seq_dirs, str(execution_dir), execution)
+                errors += [f'{execution}: {error}' for error in compare_outputs(out_dir, execution_dir)]
+
+        if not args.skip_budgets:
+            errors += check_budget(report, budgets.get(config_name, {}))
+
+        status = 'FAIL' if errors else 'ok'
+        print(f'{config_name:<24}{status:<6}{report.best_run.wall_time:>8.3f} s{report.peak_rss / 1e6:>8.1f} MB')
+
+        for error in errors:
+            print(f'    {error}')
+
+        passed &= not errors
+
+    return passed
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    if args.work_dir:
+        passed = run(args, Path(args.work_dir))
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            passed = run(args, Path(work_dir))
+
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules are imported from the root of the repository, as in the scripts
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
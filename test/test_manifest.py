@@ -0,0 +1,54 @@
+import os
+
+from dto.seq.manifest import Manifest
+
+
+def make_seq(seq_dir):
+    seq_dir.joinpath('images').mkdir(parents=True)
+    seq_dir.joinpath('images', '000000.jpeg').write_bytes(b'image')
+    seq_dir.joinpath('label.json').write_text('{}', encoding='utf-8')
+
+
+def test_fingerprint(tmp_path):
+    seq_dir = tmp_path.joinpath('1')
+    make_seq(seq_dir)
+    inputs = Manifest.fingerprint(str(seq_dir))
+    content_inputs = Manifest.fingerprint(str(seq_dir), content_hash=True)
+
+    assert list(inputs) == ['images/000000.jpeg', 'label.json']
+    assert inputs['images/000000.jpeg'][0] == len(b'image')
+    assert Manifest.fingerprint(str(seq_dir)) == inputs
+
+    # Touching a file changes its mtime but not its content
+    stat = seq_dir.joinpath('label.json').stat()
+    os.utime(seq_dir.joinpath('label.json'), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert Manifest.fingerprint(str(seq_dir)) != inputs
+    assert Manifest.fingerprint(str(seq_dir), content_hash=True) == content_inputs
+
+
+def test_file_round_trip(tmp_path):
+    out_dir = str(tmp_path.joinpath('out'))
+    manifest_file = str(Manifest.get_file(out_dir, '1'))
+    manifest = Manifest('data/1', 'config', {'label.json': 'hash'}, ['1/label_2/000000.txt'])
+
+    assert Manifest.fromfile(manifest_file) is None
+
+    manifest.tofile(manifest_file)
+    loaded = Manifest.fromfile(manifest_file)
+
+    assert loaded is not None
+    assert loaded.json == manifest.json
+    assert loaded.is_up_to_date('config', {'label.json': 'hash'})
+    assert not loaded.is_up_to_date('other_config', {'label.json': 'hash'})
+    assert not loaded.is_up_to_date('config', {'label.json': 'other_hash'})
+
+
+def test_rm_outputs(tmp_path):
+    tmp_path.joinpath('1').mkdir()
+    tmp_path.joinpath('1', 'kept.txt').write_text('', encoding='utf-8')
+    tmp_path.joinpath('1', 'output.txt').write_text('', encoding='utf-8')
+    manifest = Manifest('data/1', 'config', {}, ['1/output.txt', '1/already_removed.txt'])
+    manifest.rm_outputs(str(tmp_path))
+
+    assert [file.name for file in tmp_path.joinpath('1').iterdir()] == ['kept.txt']
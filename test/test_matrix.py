@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from utils.matrix import affine_transform, point_3d_transfrom
+
+
+@pytest.fixture
+def points() -> np.ndarray:
+    return np.random.default_rng(0).uniform(-50, 50, size=(100, 4)).astype(np.float32)
+
+
+@pytest.fixture
+def transform_matrix() -> np.ndarray:
+    return np.array([[0, -1, 0, 1], [0, 0, -1, 2], [1, 0, 0, 3]], dtype=np.float64)
+
+
+def test_affine_transform(points, transform_matrix):
+    expected = point_3d_transfrom(points[:, :3].astype(np.float64), transform_matrix)
+    original = points.copy()
+    transformed = affine_transform(points, transform_matrix)
+
+    # Other columns are kept and the input is left untouched
+    assert transformed.dtype == np.float32
+    np.testing.assert_allclose(transformed[:, :3], expected, rtol=1e-6)
+    np.testing.assert_array_equal(transformed[:, 3], points[:, 3])
+    np.testing.assert_array_equal(points, original)
+
+    out = np.empty_like(points)
+    assert affine_transform(points, transform_matrix, out=out) is out
+    np.testing.assert_array_equal(out, transformed)
+    np.testing.assert_array_equal(points, original)
+
+
+def test_affine_transform_in_place(points, transform_matrix):
+    transformed = affine_transform(points, transform_matrix)
+    scratch = np.empty((len(points), 3), dtype=np.float32)
+
+    for buffer in (None, scratch):
+        in_place = points.copy()
+        assert affine_transform(in_place, transform_matrix, out=in_place, scratch=buffer) is in_place
+        np.testing.assert_array_equal(in_place, transformed)
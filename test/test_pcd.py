@@ -0,0 +1,70 @@
+import sys
+
+import numpy as np
+import pytest
+
+from utils.pcd import lzf_decompress, read_pcd
+from utils.synthetic import write_pcd
+
+# 'abc' as a literal run, then 9 bytes referencing 3 bytes back, with the extended length byte
+REPEATED = bytes([2]) + b'abc' + bytes([7 << 5, 0, 2])
+# 'a' as a literal run, then 3 bytes referencing the previous byte
+RUN = bytes([0]) + b'a' + bytes([1 << 5, 0])
+
+
+@pytest.fixture
+def points() -> np.ndarray:
+    return np.random.default_rng(0).uniform(-50, 50, size=(100, 4)).astype(np.float32)
+
+
+@pytest.fixture(params=['pure_python', 'python_lzf'])
+def lzf_backend(request, monkeypatch):
+    if request.param == 'pure_python':
+        # A None entry makes `import lzf` raise ImportError
+        monkeypatch.setitem(sys.modules, 'lzf', None)
+    else:
+        pytest.importorskip('lzf')
+
+
+@pytest.mark.usefixtures('lzf_backend')
+def test_lzf_decompress():
+    assert lzf_decompress(REPEATED, 12) == b'abc' * 4
+    assert lzf_decompress(RUN, 4) == b'aaaa'
+    assert lzf_decompress(b'', 0) == b''
+
+
+def test_lzf_decompress_invalid(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'lzf', None)
+
+    with pytest.raises(ValueError):
+        lzf_decompress(bytes([1 << 5, 0]), 3)
+
+    with pytest.raises(ValueError):
+        lzf_decompress(REPEATED, 13)
+
+
+@pytest.mark.parametrize('data', ['binary', 'ascii', 'binary_compressed'])
+def test_read_pcd(tmp_path, points, data):
+    pcd_file = str(tmp_path.joinpath('points.pcd'))
+    write_pcd(pcd_file, points, data)
+    point_cloud = read_pcd(pcd_file)
+
+    assert point_cloud.dtype == np.float32
+    np.testing.assert_allclose(point_cloud, points, atol=1e-5 if data == 'ascii' else 0)
+
+
+def test_read_pcd_fields(tmp_path, points):
+    pcd_file = str(tmp_path.joinpath('points.pcd'))
+    write_pcd(pcd_file, points)
+
+    np.testing.assert_array_equal(read_pcd(pcd_file, ['intensity', 'x']), points[:, [3, 0]])
+
+    with pytest.raises(ValueError):
+        read_pcd(pcd_file, ['rgb'])
+
+
+def test_read_empty_pcd(tmp_path):
+    pcd_file = str(tmp_path.joinpath('points.pcd'))
+    write_pcd(pcd_file, np.empty((0, 4), dtype=np.float32))
+
+    assert read_pcd(pcd_file).shape == (0, 4)
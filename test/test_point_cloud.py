@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from utils.point_cloud import (COMPRESSIONS, crop_image, crop_range,
+                               decode_compact, encode_compact,
+                               voxel_downsample)
+
+
+@pytest.fixture
+def points() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    xyz = rng.uniform(-50, 50, size=(1000, 3))
+    intensity = rng.uniform(0, 1, size=(1000, 1))
+    return np.hstack([xyz, intensity]).astype(np.float32)
+
+
+def test_crop_range():
+    points = np.array([[0, 0, 0, 1], [1, 0, 0, 2], [0.5, -1, 0.5, 3], [0.5, 0.5, 2, 4]], dtype=np.float32)
+
+    # Min bounds are inclusive and max bounds exclusive
+    np.testing.assert_array_equal(crop_range(points, [0, -1, 0, 1, 1, 1]), points[[0, 2]])
+    assert crop_range(points[:0], [0, 0, 0, 1, 1, 1]).shape == (0, 4)
+
+
+def test_crop_image():
+    # Camera looking along x with a focal length of 100 and the principal point at the center of a 100x100 image,
+    # u = 50 - 100 * y / x and v = 50 - 100 * z / x
+    projection_matrix = np.array([[50, -100, 0, 0], [50, 0, -100, 0], [1, 0, 0, 0]], dtype=np.float64)
+    points = np.array([
+        [10, 0, 0, 1],  # center of the image
+        [-10, 0, 0, 2],  # behind the camera
+        [1, -0.6, 0, 3],  # right of the image
+        [1, 0, 0.45, 4],  # near the top of the image
+    ], dtype=np.float32)
+
+    np.testing.assert_array_equal(crop_image(points, projection_matrix, (100, 100)), points[[0, 3]])
+    np.testing.assert_array_equal(crop_image(points, projection_matrix, (100, 100), margin=20), points[[0, 2, 3]])
+
+
+def test_voxel_downsample():
+    points = np.array([
+        [0.1, 0.1, 0.1, 1],
+        [5.1, 0.1, 0.1, 2],
+        [0.9, 0.9, 0.9, 3],
+        [-0.5, 0.1, 0.1, 4],
+    ], dtype=np.float32)
+
+    # Voxels are kept in the order of their first point
+    np.testing.assert_array_equal(voxel_downsample(points, 1.0, 'first'), points[[0, 1, 3]])
+    np.testing.assert_allclose(voxel_downsample(points, [1.0, 1.0, 1.0]), [[0.5, 0.5, 0.5, 2], points[1], points[3]])
+    assert voxel_downsample(points[:0], 1.0).shape == (0, 4)
+
+    with pytest.raises(ValueError):
+        voxel_downsample(points, 1.0, 'max')
+
+
+def test_voxel_downsample_non_finite():
+    points = np.array([[0.1, 0.1, 0.1, 1], [np.nan, 0, 0, 2], [0.2, np.inf, 0, 3], [0.3, 0.3, 0.3, np.nan]],
+                      dtype=np.float32)
+
+    # Only x, y and z must be finite
+    np.testing.assert_array_equal(voxel_downsample(points, 1.0, 'first'), points[[0]])
+    np.testing.assert_array_equal(voxel_downsample(points[1:3], 1.0, 'first'), points[:0])
+
+
+def test_voxel_downsample_matches_unique(points):
+    voxels = np.floor(points[:, :3] / 5.0).astype(np.int64)
+    _, first_indices = np.unique(voxels, axis=0, return_index=True)
+
+    np.testing.assert_array_equal(voxel_downsample(points, 5.0, 'first'), points[np.sort(first_indices)])
+
+
+@pytest.mark.parametrize('compression', ['zlib', 'lzma'])
+def test_compact_lossless(points, compression):
+    buffer = encode_compact(points, compression)
+
+    assert len(buffer) < points.nbytes
+    np.testing.assert_array_equal(decode_compact(buffer), points)
+
+
+def test_compact_quantized(points):
+    decoded = decode_compact(encode_compact(points, 'quantized'))
+    extent = points.max(axis=0) - points.min(axis=0)
+
+    assert decoded.shape == points.shape
+    assert np.all(np.abs(decoded[:, :3] - points[:, :3]) <= extent[:3] / 65535)
+    assert np.all(np.abs(decoded[:, 3] - points[:, 3]) <= extent[3] / 255)
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+def test_compact_empty(compression):
+    assert decode_compact(encode_compact(np.empty((0, 4), dtype=np.float32), compression)).shape == (0, 4)
+
+
+def test_compact_invalid(points):
+    with pytest.raises(ValueError):
+        encode_compact(points, 'gzip')
+
+    with pytest.raises(ValueError):
+        decode_compact(b'XXXX' + encode_compact(points, 'zlib')[4:])
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from utils import registry
+
+
+class Shared:
+    shared = True
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+class NotShared(Shared):
+    shared = False
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    registry.clear()
+    yield
+    registry.clear()
+
+
+def test_shared_instances():
+    instance = registry.create(Shared, {'size': [1, 2], 'names': {'a': 'b'}})
+
+    assert registry.create(Shared, {'names': {'a': 'b'}, 'size': [1, 2]}) is instance
+    assert registry.create(Shared, {'size': [1, 3], 'names': {'a': 'b'}}) is not instance
+
+
+def test_not_shared_by_default():
+    assert registry.create(NotShared, {}) is not registry.create(NotShared, {})
+
+
+def test_unhashable_kwargs_are_not_shared():
+    # Arrays only differing in elements hidden by the truncated repr must not share an instance
+    values = np.zeros(2000)
+    other_values = values.copy()
+    other_values[1000] = 1.0
+    instance = registry.create(Shared, {'values': values})
+
+    assert registry.create(Shared, {'values': other_values}) is not instance
+    assert registry.create(Shared, {'values': values}) is not instance
+    assert repr(values) == repr(other_values)
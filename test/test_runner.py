@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from utils.regression import make_dataset
+from utils.runner import _log_errors, run_converter
+
+CONFIG_PATH = str(Path(__file__).parents[1].joinpath('configs', 'bat3d_to_kitti.yaml'))
+
+
+def test_log_errors(tmp_path):
+    log_file = str(tmp_path.joinpath('log.txt'))
+    results = [('data/1', None, True), ('data/2', 'Error while converting data/2\n', False), ('data/3', None, False)]
+
+    # Failed and skipped sequences are not converted
+    assert _log_errors(results, log_file) == ['data/1']
+    assert Path(log_file).read_text(encoding='utf-8') == 'Error while converting data/2\n'
+
+
+def test_profile_summary_skips_up_to_date_sequences(tmp_path, capsys):
+    seq_dirs = make_dataset(str(tmp_path.joinpath('data')))
+    out_dir = str(tmp_path.joinpath('out'))
+    log_file = str(tmp_path.joinpath('log.txt'))
+
+    run_converter(CONFIG_PATH, seq_dirs, out_dir, log_file=log_file, incremental=True, profile=True)
+    assert f'{len(seq_dirs)} sequences' in capsys.readouterr().out
+
+    # Every sequence is up to date, their profiles are the ones of the first run
+    run_converter(CONFIG_PATH, seq_dirs, out_dir, log_file=log_file, incremental=True, profile=True)
+    assert 'sequences' not in capsys.readouterr().out
+    assert not Path(log_file).exists()
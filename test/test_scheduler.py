@@ -0,0 +1,130 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from abstract.stage import Stage
+from dto.seq.seq_info import SeqInfo
+from modules.velodyne.velodyne import Velodyne
+from utils.scheduler import build_stage_graph, run_stage_graph
+
+
+class FakeStage(Stage):
+    def __init__(self, reads: Optional[Tuple[str, ...]] = None, writes: Optional[Tuple[str, ...]] = None,
+                 values: Optional[Dict[str, Any]] = None, delay: float = 0.0, log: Optional[List[str]] = None):
+        super(FakeStage, self).__init__()
+        self.reads = reads
+        self.writes = writes
+        self.values = values or {}
+        self.delay = delay
+        self.log = log if log is not None else []
+
+    def __call__(self, seq_info: SeqInfo) -> Tuple:
+        time.sleep(self.delay)
+
+        for field, value in self.values.items():
+            if field.startswith('frame_infos.'):
+                seq_info.set_frame_infos(value, **{field.split('.', 1)[1]: 'x'})
+            else:
+                setattr(seq_info, field, value)
+
+        self.log.append(self.name)
+        return seq_info,
+
+
+def make_stages(**stages: Stage) -> Dict[str, Stage]:
+    for name, stage in stages.items():
+        stage.name = name
+
+    return stages
+
+
+def run_sequential(stages: Dict[str, Stage]) -> SeqInfo:
+    output: Tuple = (SeqInfo('seq', 'out'),)
+
+    for stage in stages.values():
+        output = stage(*output)
+
+    return output[0]
+
+
+def test_dependencies():
+    stages = make_stages(
+        calib=FakeStage(reads=(), writes=('calib_file',)),
+        image=FakeStage(reads=('calib_file',), writes=('frame_infos.image_file',)),
+        velodyne=FakeStage(reads=('pcd_file',), writes=('frame_infos.velodyne_file',)),
+        label=FakeStage(reads=('frame_infos',), writes=()),
+    )
+    nodes = {node.name: node for node in build_stage_graph(stages)}
+
+    assert nodes['calib'].dependencies == set()
+    assert nodes['image'].dependencies == {'calib'}
+    assert nodes['velodyne'].dependencies == set()
+    assert nodes['label'].dependencies == {'image', 'velodyne'}
+
+
+def test_velodyne_reads_follow_mode():
+    image = FakeStage(reads=('frame_names',), writes=('image_size',))
+
+    # Only the image fov crop waits for the image size, the stream of the stage is opened once it is set
+    for mode, dependencies in (('default', set()), ('image_fov', {'image'})):
+        stages = make_stages(image=image, velodyne=Velodyne(mode=mode))
+        nodes = {node.name: node for node in build_stage_graph(stages)}
+        assert nodes['velodyne:open'].dependencies == dependencies
+
+
+def test_undeclared_stage_is_a_barrier():
+    log: List[str] = []
+    stages = make_stages(
+        first=FakeStage(reads=(), writes=('calib_file',), values={'calib_file': 'first'}, delay=0.1, log=log),
+        barrier=FakeStage(values={'image_file': 'barrier'}, log=log),
+        last=FakeStage(reads=(), writes=('pcd_file',), values={'pcd_file': 'last'}, log=log),
+    )
+    nodes = build_stage_graph(stages)
+
+    assert nodes[0].reads == () and nodes[0].writes == ('calib_file',)
+    assert nodes[1].reads == () and nodes[1].writes == ()
+    assert nodes[1].dependencies == {'first'}
+    assert nodes[2].dependencies == {'barrier'}
+
+    seq_info, = run_stage_graph(nodes, SeqInfo('seq', 'out'))
+
+    # The last stage does not read anything but still waits for the undeclared one
+    assert log == ['first', 'barrier', 'last']
+    assert (seq_info.calib_file, seq_info.image_file, seq_info.pcd_file) == ('first', 'barrier', 'last')
+
+
+def test_conflicting_writes_are_merged_in_config_order():
+    log: List[str] = []
+    stages = make_stages(
+        slow=FakeStage(reads=(), writes=('image_file',), values={'image_file': 'slow'}, delay=0.2, log=log),
+        fast=FakeStage(reads=(), writes=('image_file',), values={'image_file': 'fast'}, log=log),
+    )
+    seq_info, = run_stage_graph(build_stage_graph(stages), SeqInfo('seq', 'out'))
+
+    # Both run at once and the later stage finishes first, its write must still win as in the sequential execution
+    assert log == ['fast', 'slow']
+    assert seq_info.image_file == 'fast'
+    assert seq_info.image_file == run_sequential(stages).image_file
+
+
+def test_frame_infos_are_merged_in_config_order():
+    stages = make_stages(
+        slow=FakeStage(reads=(), writes=('frame_infos.image_file',), values={'frame_infos.image_file': ['0', '1']},
+                       delay=0.2),
+        fast=FakeStage(reads=(), writes=('frame_infos.calib_file',), values={'frame_infos.calib_file': ['2', '0']}),
+    )
+    seq_info, = run_stage_graph(build_stage_graph(stages), SeqInfo('seq', 'out'))
+    expected = run_sequential(stages)
+
+    assert [frame_info.frame_name for frame_info in seq_info.frame_infos] == ['0', '1', '2']
+    assert seq_info.asdict() == expected.asdict()
+
+
+def test_deadlock_raises():
+    stages = make_stages(stage=FakeStage(reads=(), writes=('image_file',)))
+    nodes = build_stage_graph(stages)
+    nodes[0].dependencies.add('missing')
+
+    with pytest.raises(RuntimeError, match='deadlocked'):
+        run_stage_graph(nodes, SeqInfo('seq', 'out'))
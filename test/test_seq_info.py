@@ -0,0 +1,63 @@
+import numpy as np
+
+from dto.seq.seq_info import SeqInfo
+
+
+def test_merge_fields():
+    seq_info = SeqInfo('data/1', 'out')
+    seq_info.calib_file = 'calib.json'
+    other = SeqInfo('data/1', 'out')
+    other.image_size = (640, 360)
+    other.bin_pc_transform_matrix = np.identity(4)
+    other.calib_file = 'other_calib.json'
+    seq_info.merge(other, ['image_size', 'bin_pc_transform_matrix'])
+
+    assert seq_info.image_size == (640, 360)
+    assert seq_info.bin_pc_transform_matrix is other.bin_pc_transform_matrix
+    assert seq_info.calib_file == 'calib.json'
+
+
+def test_merge_frame_infos():
+    seq_info = SeqInfo('data/1', 'out')
+    seq_info.set_frame_infos(['0', '1'], image_file='image.jpeg')
+    other = SeqInfo('data/1', 'out')
+    other.set_frame_infos(['1', '2'], pcd_file='points.pcd')
+    other.set_frame_infos(['1'], image_file='other_image.jpeg')
+    seq_info.merge(other, ['frame_infos.pcd_file'])
+    frame_infos = seq_info.frame_infos
+
+    # Frames are updated in place and missing ones are added in the order of `other`, other fields are kept
+    assert frame_infos is not None
+    assert [frame_info.frame_name for frame_info in frame_infos] == ['0', '1', '2']
+    assert [frame_info.pcd_file for frame_info in frame_infos] == [None, 'points.pcd', 'points.pcd']
+    assert [frame_info.image_file for frame_info in frame_infos] == ['image.jpeg', 'image.jpeg', None]
+
+
+def test_frame_info_index():
+    seq_info = SeqInfo('data/1', 'out')
+
+    assert seq_info.frame_infos is None
+    assert seq_info.get_frame_info('0') is None
+
+    seq_info.set_frame_infos(['1', '0'], image_file='image.jpeg')
+    seq_info.set_frame_info('0', pcd_file='points.pcd')
+    frame_info = seq_info.get_frame_info('0')
+    frame_infos = seq_info.frame_infos
+
+    # Frames are updated in place and kept in insertion order
+    assert frame_info is not None and frame_infos is not None
+    assert (frame_info.image_file, frame_info.pcd_file) == ('image.jpeg', 'points.pcd')
+    assert [frame_info.frame_name for frame_info in frame_infos] == ['1', '0']
+
+
+def test_frame_infos_setter_and_asdict():
+    seq_info = SeqInfo('data/1', 'out')
+    seq_info.set_frame_infos(['0', '1'], image_file='image.jpeg')
+    other = SeqInfo('data/1', 'out')
+    other.frame_infos = seq_info.frame_infos
+
+    # Frame infos are indexed by name and exported as a list
+    assert other.get_frame_info('1') is seq_info.get_frame_info('1')
+    assert '_frame_infos' not in other.asdict()
+    assert other.asdict()['frame_infos'] == [{'frame_name': '0', 'image_file': 'image.jpeg'},
+                                             {'frame_name': '1', 'image_file': 'image.jpeg'}]
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from utils.transform_graph import TransformGraph
+
+
+def rotation_z(angle: float) -> np.ndarray:
+    cos, sin = np.cos(angle), np.sin(angle)
+    return np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
+
+
+@pytest.fixture
+def graph() -> TransformGraph:
+    graph = TransformGraph()
+    graph.add('lidar', 'kitti_velo', np.hstack([rotation_z(np.pi / 2), [[1], [2], [3]]]))
+    # Camera with x right, y down and z forward from kitti_velo with x forward, y left and z up
+    graph.add('kitti_velo', 'camera', np.array([[0, -1, 0, 0], [0, 0, -1, 0], [1, 0, 0, 0]]))
+    graph.add('camera', 'image', np.array([[100, 0, 50, 0], [0, 100, 50, 0], [0, 0, 1, 0]]), invertible=False)
+    return graph
+
+
+def test_transforms(graph):
+    point = np.array([1.0, 2.0, 3.0, 1.0])
+    lidar_to_camera = graph.get('lidar', 'camera', ret_homo=True)
+
+    assert graph.frames == ['camera', 'image', 'kitti_velo', 'lidar']
+    assert graph.find_path('lidar', 'image') == ['lidar', 'kitti_velo', 'camera', 'image']
+    assert graph.get('lidar', 'camera').shape == (3, 4)
+    lidar_to_velo = graph.get('lidar', 'kitti_velo', ret_homo=True)
+    velo_to_camera = graph.get('kitti_velo', 'camera', ret_homo=True)
+    np.testing.assert_allclose(lidar_to_camera, velo_to_camera @ lidar_to_velo)
+    np.testing.assert_allclose(graph.get('camera', 'lidar', True) @ lidar_to_camera @ point, point)
+    np.testing.assert_allclose(graph.get('lidar', 'lidar'), np.identity(4)[:3])
+
+
+def test_projection_is_not_inverted(graph):
+    graph.get('lidar', 'image')
+
+    with pytest.raises(KeyError):
+        graph.get('image', 'camera')
+
+
+def test_transforms_are_memoized(graph):
+    transform_matrix = graph.get('lidar', 'camera', ret_homo=True)
+
+    assert graph.get('lidar', 'camera', ret_homo=True) is transform_matrix
+    assert not transform_matrix.flags.writeable
+
+    # New edges may shorten paths, memoized transforms are recomputed
+    graph.add('lidar', 'camera', np.identity(4))
+    np.testing.assert_array_equal(graph.get('lidar', 'camera', ret_homo=True), np.identity(4))
+
+
+def test_axis_permutation(graph):
+    assert graph.get_axis_permutation('kitti_velo', 'camera') == (1, 2, 0)
+    assert graph.get_axis_permutation('camera', 'camera') == (0, 1, 2)
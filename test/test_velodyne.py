@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from dto.kitti.velodyne.frame import Frame
+from dto.kitti.velodyne.velodyne import Velodyne
+
+
+@pytest.fixture
+def points() -> np.ndarray:
+    return np.random.default_rng(0).uniform(-50, 50, size=(100, 4)).astype(np.float32)
+
+
+def test_bin_frame(tmp_path, points):
+    Frame(1, data=points).tofile(str(tmp_path))
+    frame = Frame.parse(str(tmp_path.joinpath('000001.bin')))
+
+    # `data` is the flat array of the file as in KITTI, `points` one row per point
+    assert frame.compression is None
+    assert frame.name == '000001.bin'
+    assert frame.n_points == 100
+    np.testing.assert_array_equal(frame.data, points.reshape(-1))
+    np.testing.assert_array_equal(frame.points, points)
+    assert isinstance(frame.points, np.memmap)
+
+
+@pytest.mark.parametrize('compression', ['zlib', 'quantized'])
+def test_compact_frame(tmp_path, points, compression):
+    Frame(1, data=points, compression=compression).tofile(str(tmp_path))
+    frame = Frame.parse(str(tmp_path.joinpath('000001.cbin')), n_feature=3)
+
+    # Compression and number of features come from the header of the file
+    assert frame.compression == compression
+    assert frame.n_feature == 4
+    assert frame.name == '000001.cbin'
+    assert frame.n_points == 100
+    assert frame.data.shape == (400,)
+    # Features other than x, y and z are quantized to 8 bits
+    np.testing.assert_allclose(frame.points, points, atol=0 if compression == 'zlib' else 100 / 255)
+
+
+def test_assigned_data(points):
+    frame = Frame(1, data=points.reshape(-1))
+
+    assert frame.n_points == 100
+    np.testing.assert_array_equal(frame.points, points)
+
+
+def test_velodyne(tmp_path, points):
+    Frame(1, data=points).tofile(str(tmp_path))
+    Frame(2, data=points[:10], compression='zlib').tofile(str(tmp_path))
+    Frame(10, data=points[:0]).tofile(str(tmp_path))
+    tmp_path.joinpath('000003.txt').write_text('', encoding='utf-8')
+    velodyne = Velodyne.parse(str(tmp_path))
+
+    assert len(velodyne) == 3
+    frames = [(frame.name, frame.n_points) for frame in velodyne]
+
+    assert frames == [('000001.bin', 100), ('000002.cbin', 10), ('000010.bin', 0)]
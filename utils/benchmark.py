@@ -0,0 +1,74 @@
+import resource
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from converter import Converter
+from dto.benchmark.report import BenchmarkReport, BenchmarkRun
+from dto.seq.profile import PhaseProfile, StageProfile
+from utils.profiler import format_stages, io_counters, sum_stages
+
+
+def get_peak_rss() -> int:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def average_stages(stages: Dict[str, StageProfile], runs: int) -> Dict[str, StageProfile]:
+    average = {}
+
+    for stage_name, stage in stages.items():
+        phases = {phase_name: PhaseProfile(phase.wall_time / runs, phase.cpu_time / runs, phase.read_bytes // runs,
+                                           phase.write_bytes // runs, phase.calls // runs)
+                  for phase_name, phase in stage.phases.items()}
+        average[stage_name] = StageProfile(phases, stage.frames // runs)
+
+    return average
+
+
+def run_benchmark(config_path: str, seq_dirs: List[str], out_dir: str, repeats: int = 3,
+                  execution: str = 'sequential') -> BenchmarkReport:
+    '''
+        Converts `seq_dirs` into `out_dir` `repeats` times with one Converter and measures every run. The Converter
+        is built before the first run and `out_dir` is emptied before every run, so runs do the same work. Frames
+        are the frames of `SeqInfo.frame_names`, configs made only of label stages have none and are compared by
+        wall time.
+    '''
+    converter = Converter(config_path, execution=execution, profile=True)
+    runs = []
+    stage_profiles = []
+
+    for _ in range(repeats):
+        shutil.rmtree(out_dir, ignore_errors=True)
+        read_bytes, write_bytes = io_counters()
+        start_time = time.perf_counter()
+        frames = 0
+
+        for seq_dir in seq_dirs:
+            seq_info = converter(seq_dir, out_dir)
+            frames += max((stage.frames for stage in seq_info.profile.values()), default=0)
+            stage_profiles.append(seq_info.profile)
+
+        wall_time = time.perf_counter() - start_time
+        end_read_bytes, end_write_bytes = io_counters()
+        runs.append(BenchmarkRun(wall_time, frames, end_read_bytes - read_bytes, end_write_bytes - write_bytes))
+
+    stages = average_stages(sum_stages(stage_profiles), repeats)
+    return BenchmarkReport(str(config_path), execution, [str(seq_dir) for seq_dir in seq_dirs], runs, stages,
+                           get_peak_rss(), datetime.now().isoformat(timespec='seconds'))
+
+
+def format_report(report: BenchmarkReport) -> str:
+    lines = [f'{report.config} ({report.execution}), {len(report.seq_dirs)} sequences, {len(report.runs)} runs']
+    header = f'{"run":<6}{"wall s":>10}{"frames":>10}{"frames/s":>10}{"read MB/s":>12}{"write MB/s":>12}'
+    lines += [header, '-' * len(header)]
+
+    for i, run in enumerate(report.runs):
+        lines.append(f'{i:<6}{run.wall_time:>10.3f}{run.frames:>10}{run.frames_per_s:>10.1f}'
+                     f'{run.read_mb_per_s:>12.1f}{run.write_mb_per_s:>12.1f}')
+
+    best_run = report.best_run
+    lines.append(f'best {best_run.frames_per_s:.1f} frames/s, peak RSS {report.peak_rss / 1e6:.1f} MB')
+    lines += ['', 'stages, average of the runs', format_stages(report.stages)]
+    return '\n'.join(lines)
@@ -1,5 +1,7 @@
+import os
+import shutil
 from pathlib import Path
-from typing import Any, Optional, TextIO
+from typing import Any, List, Optional, TextIO
 
 
 def abs_path(path):
@@ -15,6 +17,25 @@ def open_file(file_path: str, *args: Any, **kwargs: Any) -> TextIO:
     return path.open(*args, **kwargs)
 
 
+def move_tree(src_dir: str, dst_dir: str) -> List[str]:
+    '''
+        Moves every file of `src_dir` to the same path in `dst_dir`, replacing existing files and keeping the other
+        ones, then removes `src_dir`. Returns the moved files relative to `dst_dir`.
+    '''
+    moved = []
+
+    for file in sorted(Path(src_dir).rglob('*')):
+        if file.is_file():
+            relative_file = file.relative_to(src_dir)
+            dst_file = Path(dst_dir).joinpath(relative_file)
+            dst_file.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(file, dst_file)
+            moved.append(relative_file.as_posix())
+
+    shutil.rmtree(src_dir, ignore_errors=True)
+    return moved
+
+
 def get_file_with_stem(dirname: str, stem: str, suffix: str = '.*', abs_path: bool = True) -> Optional[str]:
     files = list(Path(dirname).glob(f'{stem}{suffix}'))
 
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import ast
+import copy
+import hashlib
+import os
+import pickle
+from functools import lru_cache
 from importlib import import_module
-from typing import Any, Tuple
+from pathlib import Path
+from typing import Any, Dict, Tuple
 
+import yaml
+from fvcore.common.config import BASE_KEY
 from fvcore.common.config import CfgNode as _CfgNode
 
+from utils import registry
+
 MODULE_KEY = 'module'
 CLASS_KEY = 'class'
 EXTRALIBS_KEY = 'extralibs'
@@ -20,6 +31,80 @@ NOT_EVAL_KEYWORDS = [
     RM_KEY,
 ]
 
+# Folder where parsed YAML files are persisted between processes, disabled if not set
+CACHE_DIR_ENV = 'CONFIG_CACHE_DIR'
+
+YAMLLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# (path, mtime_ns, size, allow_unsafe) -> parsed YAML file
+_yaml_cache: Dict[Tuple[str, int, int, bool], Any] = {}
+
+
+def _parse_yaml(path: Path, allow_unsafe: bool) -> Any:
+    with path.open(mode='r', encoding='utf-8') as f:
+        try:
+            return yaml.load(f, Loader=YAMLLoader)
+        except yaml.constructor.ConstructorError:
+            if not allow_unsafe:
+                raise
+
+    with path.open(mode='r', encoding='utf-8') as f:
+        return yaml.unsafe_load(f)
+
+
+def _load_yaml(filename: str, allow_unsafe: bool = False) -> Any:
+    '''
+        Parses a YAML file once per process, or once per change of the file, and returns a copy of it. Parsed files
+        are also persisted in the folder given by the `CONFIG_CACHE_DIR` environment variable if it is set.
+    '''
+    path = Path(filename).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size, allow_unsafe)
+
+    if key not in _yaml_cache:
+        cache_dir = os.environ.get(CACHE_DIR_ENV)
+        cache_file = None
+
+        if cache_dir:
+            cache_file = Path(cache_dir).joinpath(f'{hashlib.sha1(repr(key).encode("utf-8")).hexdigest()}.pkl')
+
+        if cache_file is not None and cache_file.exists():
+            with cache_file.open(mode='rb') as f:
+                _yaml_cache[key] = pickle.load(f)
+        else:
+            _yaml_cache[key] = _parse_yaml(path, allow_unsafe)
+
+            if cache_file is not None:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+
+                with tmp_file.open(mode='wb') as f:
+                    pickle.dump(_yaml_cache[key], f)
+
+                tmp_file.replace(cache_file)
+
+    return copy.deepcopy(_yaml_cache[key])
+
+
+@lru_cache(maxsize=None)
+def _compile(expression: str) -> Tuple[bool, Any]:
+    # Literals, e.g. the quoted strings of the configs, are evaluated once without `eval`
+
+    try:
+        return True, ast.literal_eval(expression)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return False, compile(expression, '<config>', 'eval')
+
+
+def _merge_a_into_b(a: Dict[str, Any], b: Dict[str, Any]) -> None:
+    # merge dict a into dict b. values in a will overwrite b.
+    for key, value in a.items():
+        if isinstance(value, dict) and key in b:
+            assert isinstance(b[key], dict), f'Cannot inherit key {key} from base!'
+            _merge_a_into_b(value, b[key])
+        else:
+            b[key] = value
+
 
 class CfgNode(_CfgNode):
     def __init__(self, *args, **kwargs):
@@ -37,13 +122,14 @@ class CfgNode(_CfgNode):
                 module = config[MODULE_KEY]
                 class_ = config[CLASS_KEY]
                 config_kwargs = config.get(class_, {})
-                return getattr(import_module(module), class_)(**config_kwargs)
+                return registry.create(getattr(import_module(module), class_), config_kwargs)
 
         elif isinstance(config, list):
             config = list(map(lambda ele: CfgNode._eval(ele, global_context, local_context), config))
 
         elif isinstance(config, str):
-            config = eval(config, global_context, local_context)
+            is_literal, value = _compile(config)
+            config = copy.deepcopy(value) if is_literal else eval(value, global_context, local_context)
 
         return config
 
@@ -80,6 +166,13 @@ class CfgNode(_CfgNode):
 
         return config, extralibs
 
+    def eval_key(self, name: str, default: Any = None) -> Any:
+        '''Evaluates the entry `name` alone, e.g. a non-stage entry of a converter config, without its stages.'''
+        if self.get(name) is None:
+            return default
+
+        return CfgNode._eval(copy.deepcopy(self.get(name)), {}, self)
+
     def __delitem__(self, name: str) -> None:
         name_parts = name.split('.')
         dic = self
@@ -103,8 +196,30 @@ class CfgNode(_CfgNode):
 
     @classmethod
     def load_yaml_with_base(cls, filename: str, allow_unsafe: bool = False) -> CfgNode:
-        cfg = super(CfgNode, cls).load_yaml_with_base(filename, allow_unsafe)
-        return cls(cfg)
+        '''Same as fvcore's `load_yaml_with_base` for local files, with every file parsed once (see `_load_yaml`).'''
+        return cls(cls._load_dict_with_base(str(filename), allow_unsafe))
+
+    @classmethod
+    def _load_dict_with_base(cls, filename: str, allow_unsafe: bool = False) -> Dict[str, Any]:
+        cfg = _load_yaml(filename, allow_unsafe)
+
+        if BASE_KEY not in cfg:
+            return cfg
+
+        base_cfg_files = cfg.pop(BASE_KEY)
+        base_cfg: Dict[str, Any] = {}
+
+        for base_cfg_file in base_cfg_files if isinstance(base_cfg_files, list) else [base_cfg_files]:
+            base_cfg_file = os.path.expanduser(base_cfg_file)
+
+            # the path to base cfg is relative to the config file itself.
+            if not os.path.isabs(base_cfg_file):
+                base_cfg_file = os.path.join(os.path.dirname(filename), base_cfg_file)
+
+            _merge_a_into_b(cls._load_dict_with_base(base_cfg_file, allow_unsafe), base_cfg)
+
+        _merge_a_into_b(cfg, base_cfg)
+        return base_cfg
 
 
 global_cfg = CfgNode(new_allowed=True)
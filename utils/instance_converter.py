@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 
@@ -7,68 +7,95 @@ from dto.kitti.label.instance import Instance as KITTIInstance
 from dto.pred.box3d import LiDARBox3D
 from dto.scale_ai.instance import Instance as ScaleAIInstance
 from dto.scale_ai.instance import Instance3D as ScaleAIInstance3D
-from utils.kitti import calc_alpha, compute_box_3d
+from utils.kitti import calc_alpha_batch, compute_box_3d_batch
 from utils.matrix import homo_mat, map_dimension, point_3d_transfrom
 
 
-def bat3d_to_kitti(bat3d_instance: BAT3DInstance, extrinsic: np.ndarray, intrinsic: np.ndarray,
-                   image_size: Tuple[int, int]) -> KITTIInstance:
-    type_ = bat3d_instance.class_.replace(' ', '_') if bat3d_instance.class_ != 'Others' else 'DontCare'
-    truncated = 0.0
-    occluded = 0
-    width = bat3d_instance.width
-    height = bat3d_instance.height
-    length = bat3d_instance.length
-    x = bat3d_instance.x
-    y = bat3d_instance.y
-    z = bat3d_instance.z
-    rotation_y = bat3d_instance.rotationY
-    score = bat3d_instance.score
-    track_id = bat3d_instance.trackId
-
-    # Dimensions
-    bat3d_dim_map = {
-        'x': width,
-        'y': length,
-        'z': height,
-    }
-    cam_dim_map = {
-        'width': 'x',
-        'height': 'y',
-        'length': 'z',
-    }
-    width, height, length = map_dimension(extrinsic, bat3d_dim_map, cam_dim_map)
-    dimensions = (height, width, length)
+def bat3d_boxes_to_kitti(sizes: np.ndarray, centers: np.ndarray, rotations: np.ndarray, extrinsic: np.ndarray,
+                         intrinsic: np.ndarray, image_size: Tuple[int, int]) -> Dict[str, np.ndarray]:
+    '''
+        Converts N BAT3D boxes into the camera frame of KITTI in one pass.
+
+        Args:
+            sizes: (N, 3) array of width, length and height of the boxes.
+            centers: (N, 3) array of x, y and z of the box centers in the lidar frame.
+            rotations: (N,) array of rotationY.
+            extrinsic: (3, 4) lidar to camera matrix.
+            intrinsic: Camera matrix, projection matrix is its first 3 rows.
+            image_size: (width, height) the 2D boxes are clipped to.
+        Returns: Dict of
+            dimensions: (N, 3) height, width and length.
+            locations: (N, 3) bottom-side centers in the camera frame.
+            rotation_y: (N,) rotations around the Y-axis of the camera in [-pi, pi].
+            alpha: (N,) observation angles.
+            bboxes: (N, 4) int left, top, right and bottom, -10 for boxes with a corner behind the camera.
+    '''
+    sizes = np.asarray(sizes, dtype=np.float64).reshape(-1, 3)
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+    rotations = np.asarray(rotations, dtype=np.float64).reshape(-1)
+
+    # Dimensions, axes of the lidar frame map to the same axes of the camera frame for every box
+    columns = map_dimension(extrinsic, {'x': 0, 'y': 1, 'z': 2}, {'width': 'x', 'height': 'y', 'length': 'z'})
+    width, height, length = (sizes[:, column] for column in columns)
+    dimensions = np.stack((height, width, length), axis=1)
 
     # Location
-    location = np.array([[x, y, z]])
-    location = point_3d_transfrom(location, extrinsic)[0]
-    x, y, z = location
-    y += height / 2
-    location = (x, y, z)
+    locations = point_3d_transfrom(centers, extrinsic)
+    locations[:, 1] += height / 2
 
     # Rotation Y
-    rotation_y = - rotation_y - np.pi / 2
+    rotation_y = - rotations - np.pi / 2
     rotation_y = np.arctan2(np.sin(rotation_y), np.cos(rotation_y))
 
     # BBox
-    projection_mat = homo_mat(intrinsic)
-    projection_mat = projection_mat[:3]
-    bbox_8points, _ = compute_box_3d(width, height, length, location, rotation_y, projection_mat)
-
-    if bbox_8points is not None:
-        x_min = max(0, round(min(bbox_8points[:, 0])))
-        x_max = min(round(max(bbox_8points[:, 0])), image_size[0])
-        y_min = max(0, round(min(bbox_8points[:, 1])))
-        y_max = min(round(max(bbox_8points[:, 1])), image_size[1])
-    else:
-        x_min = x_max = y_min = y_max = -10
-
-    bbox = (x_min, y_min, x_max, y_max)
+    corners_2d, _, valid = compute_box_3d_batch(width, height, length, locations, rotation_y, homo_mat(intrinsic),
+                                                dtype=np.float64)
+    bboxes = np.stack((
+        np.maximum(0, np.round(corners_2d[..., 0].min(axis=1))),
+        np.maximum(0, np.round(corners_2d[..., 1].min(axis=1))),
+        np.minimum(np.round(corners_2d[..., 0].max(axis=1)), image_size[0]),
+        np.minimum(np.round(corners_2d[..., 1].max(axis=1)), image_size[1]),
+    ), axis=1)
+    bboxes[~valid] = -10
 
     # Alpha
-    alpha = calc_alpha(location, rotation_y)
-    return KITTIInstance(type_, truncated, occluded, bbox, alpha, dimensions, location, rotation_y, score, track_id)
+    alpha = calc_alpha_batch(locations, rotation_y, dtype=np.float64)
+
+    boxes = {
+        'dimensions': dimensions,
+        'locations': locations,
+        'rotation_y': rotation_y,
+        'alpha': alpha,
+        'bboxes': bboxes.astype(np.int64),
+    }
+    return boxes
+
+
+def bat3d_instances_to_kitti(bat3d_instances: List[BAT3DInstance], extrinsic: np.ndarray, intrinsic: np.ndarray,
+                             image_size: Tuple[int, int]) -> List[KITTIInstance]:
+    '''Converts the instances of a frame, or of a whole sequence, with `bat3d_boxes_to_kitti`.'''
+    if not bat3d_instances:
+        return []
+
+    sizes = np.array([(instance.width, instance.length, instance.height) for instance in bat3d_instances])
+    centers = np.array([(instance.x, instance.y, instance.z) for instance in bat3d_instances])
+    rotations = np.array([instance.rotationY for instance in bat3d_instances])
+    boxes = bat3d_boxes_to_kitti(sizes, centers, rotations, extrinsic, intrinsic, image_size)
+    kitti_instances = []
+
+    for bat3d_instance, dimensions, location, rotation_y, alpha, bbox in zip(
+            bat3d_instances, boxes['dimensions'].tolist(), boxes['locations'].tolist(), boxes['rotation_y'].tolist(),
+            boxes['alpha'].tolist(), boxes['bboxes'].tolist()):
+        type_ = bat3d_instance.class_.replace(' ', '_') if bat3d_instance.class_ != 'Others' else 'DontCare'
+        kitti_instances.append(KITTIInstance(type_, 0.0, 0, tuple(bbox), alpha, tuple(dimensions), tuple(location),
+                                             rotation_y, bat3d_instance.score, bat3d_instance.trackId))
+
+    return kitti_instances
+
+
+def bat3d_to_kitti(bat3d_instance: BAT3DInstance, extrinsic: np.ndarray, intrinsic: np.ndarray,
+                   image_size: Tuple[int, int]) -> KITTIInstance:
+    return bat3d_instances_to_kitti([bat3d_instance], extrinsic, intrinsic, image_size)[0]
 
 
 def lidar_box3d_to_bat3d(lidar_box3d: LiDARBox3D, trackId: int, frameIdx: int, prelabel: bool = None) -> BAT3DInstance:
@@ -80,9 +107,13 @@ def lidar_box3d_to_bat3d(lidar_box3d: LiDARBox3D, trackId: int, frameIdx: int, p
 
 def lidar_box3d_to_kitti(lidar_box3d: LiDARBox3D, Tr_velo_to_cam: np.ndarray, cam_to_image: np.ndarray,
                          image_size: Tuple[int, int]) -> KITTIInstance:
-    bat3d_instance = lidar_box3d_to_bat3d(lidar_box3d, 0, 0)
-    kitti_instance = bat3d_to_kitti(bat3d_instance, Tr_velo_to_cam, cam_to_image, image_size)
-    return kitti_instance
+    return lidar_boxes3d_to_kitti([lidar_box3d], Tr_velo_to_cam, cam_to_image, image_size)[0]
+
+
+def lidar_boxes3d_to_kitti(lidar_boxes3d: List[LiDARBox3D], Tr_velo_to_cam: np.ndarray, cam_to_image: np.ndarray,
+                           image_size: Tuple[int, int]) -> List[KITTIInstance]:
+    bat3d_instances = [lidar_box3d_to_bat3d(lidar_box3d, 0, 0) for lidar_box3d in lidar_boxes3d]
+    return bat3d_instances_to_kitti(bat3d_instances, Tr_velo_to_cam, cam_to_image, image_size)
 
 
 def scale_ai_to_bat3d(scale_ai_instance: ScaleAIInstance, track_id: int, frame_id: int) -> BAT3DInstance:
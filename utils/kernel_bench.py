@@ -0,0 +1,207 @@
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dto.bat3d.instance import Instance as BAT3DInstance
+from utils.instance_converter import bat3d_instances_to_kitti, bat3d_to_kitti
+from utils.kitti import (calc_alpha, calc_alpha_batch, compute_box_3d,
+                         compute_box_3d_batch)
+from utils.matrix import (affine_transform, homo_mat, map_dimension,
+                          point_3d_transfrom)
+from utils.point_cloud import crop_image, crop_range, voxel_downsample
+from utils.synthetic import (CLASS_SIZES, CLASSES, camera_extrinsic,
+                             camera_intrinsic)
+
+BOX_SIZES = (1, 100, 10000)
+POINT_SIZES = (10000, 100000, 1000000)
+IMAGE_SIZE = (1920, 1080)
+
+
+class Kernel:
+    '''
+        A geometry kernel timed at every size of `sizes`. `setup(size, rng)` returns the inputs of a size, and every
+        variant of `variants` (e.g. 'scalar' or 'batched') processes all of them in one call.
+    '''
+
+    def __init__(self, name: str, sizes: Tuple[int, ...], setup: Callable[[int, np.random.Generator], Any],
+                 variants: Dict[str, Callable[[Any], Any]]):
+        self.name = name
+        self.sizes = sizes
+        self.setup = setup
+        self.variants = variants
+
+
+def setup_boxes(size: int, rng: np.random.Generator) -> Dict[str, Any]:
+    # Boxes in front of the camera, in the lidar frame as annotated in BAT3D
+    instances = []
+
+    for i in range(size):
+        class_ = CLASSES[rng.integers(len(CLASSES))]
+        width, length, height = CLASS_SIZES[class_]
+        instances.append(BAT3DInstance(class_, width, length, height, float(rng.uniform(5.0, 60.0)),
+                                       float(rng.uniform(-15.0, 15.0)), float(rng.uniform(-1.5, 0.5)),
+                                       float(rng.uniform(-np.pi, np.pi)), i, 0))
+
+    extrinsic = camera_extrinsic()
+    intrinsic = camera_intrinsic(IMAGE_SIZE, 60.0)
+    locations = point_3d_transfrom(np.array([[ins.x, ins.y, ins.z] for ins in instances]), extrinsic)
+    boxes = {
+        'instances': instances,
+        'extrinsic': extrinsic,
+        'intrinsic': intrinsic,
+        'projection': homo_mat(intrinsic)[:3],
+        'locations': locations,
+        'rotations': np.array([ins.rotationY for ins in instances]),
+        'sizes': np.array([[ins.width, ins.length, ins.height] for ins in instances]),
+    }
+    return boxes
+
+
+def setup_points(size: int, rng: np.random.Generator) -> Dict[str, Any]:
+    points = {
+        'points': rng.uniform(-80.0, 80.0, size=(size, 3)),
+        'point_cloud': rng.uniform(-80.0, 80.0, size=(size, 4)).astype(np.float32),
+        'scratch': np.empty((size, 3), dtype=np.float32),
+        'transform': camera_extrinsic(),
+        'projection': homo_mat(camera_intrinsic(IMAGE_SIZE, 60.0))[:3] @ homo_mat(camera_extrinsic()),
+    }
+    return points
+
+
+def map_dimension_scalar(boxes: Dict[str, Any]) -> List[Tuple[float, float, float]]:
+    cam_dim_map = {'width': 'x', 'height': 'y', 'length': 'z'}
+    return [map_dimension(boxes['extrinsic'], {'x': ins.width, 'y': ins.length, 'z': ins.height}, cam_dim_map)
+            for ins in boxes['instances']]
+
+
+def compute_box_3d_scalar(boxes: Dict[str, Any]) -> List[Tuple[Optional[np.ndarray], np.ndarray]]:
+    return [compute_box_3d(ins.width, ins.height, ins.length, location, rotation_y, boxes['projection'])
+            for ins, location, rotation_y in zip(boxes['instances'], boxes['locations'], boxes['rotations'])]
+
+
+def calc_alpha_scalar(boxes: Dict[str, Any]) -> List[float]:
+    return [calc_alpha(location, rotation_y) for location, rotation_y in zip(boxes['locations'], boxes['rotations'])]
+
+
+def compute_box_3d_batched(boxes: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    sizes = boxes['sizes']
+    return compute_box_3d_batch(sizes[:, 0], sizes[:, 2], sizes[:, 1], boxes['locations'], boxes['rotations'],
+                                boxes['projection'])
+
+
+def calc_alpha_batched(boxes: Dict[str, Any]) -> np.ndarray:
+    return calc_alpha_batch(boxes['locations'], boxes['rotations'])
+
+
+def bat3d_to_kitti_scalar(boxes: Dict[str, Any]) -> List[Any]:
+    return [bat3d_to_kitti(ins, boxes['extrinsic'], boxes['intrinsic'], IMAGE_SIZE) for ins in boxes['instances']]
+
+
+def bat3d_to_kitti_batched(boxes: Dict[str, Any]) -> List[Any]:
+    return bat3d_instances_to_kitti(boxes['instances'], boxes['extrinsic'], boxes['intrinsic'], IMAGE_SIZE)
+
+
+def point_3d_transfrom_batched(points: Dict[str, Any]) -> np.ndarray:
+    return point_3d_transfrom(points['points'], points['transform'])
+
+
+def affine_transform_inplace(points: Dict[str, Any]) -> np.ndarray:
+    point_cloud = points['point_cloud']
+    return affine_transform(point_cloud, points['transform'], out=point_cloud, scratch=points['scratch'])
+
+
+def crop_range_batched(points: Dict[str, Any]) -> np.ndarray:
+    return crop_range(points['point_cloud'], [0, -40, -3, 70.4, 40, 1])
+
+
+def crop_image_batched(points: Dict[str, Any]) -> np.ndarray:
+    return crop_image(points['point_cloud'], points['projection'], IMAGE_SIZE)
+
+
+def voxel_downsample_mean(points: Dict[str, Any]) -> np.ndarray:
+    return voxel_downsample(points['point_cloud'], [0.05, 0.05, 0.1], 'mean')
+
+
+def voxel_downsample_first(points: Dict[str, Any]) -> np.ndarray:
+    return voxel_downsample(points['point_cloud'], [0.05, 0.05, 0.1], 'first')
+
+
+KERNELS = {
+    'point_3d_transfrom': Kernel('point_3d_transfrom', POINT_SIZES, setup_points,
+                                 {'batched': point_3d_transfrom_batched, 'affine_float32': affine_transform_inplace}),
+    'map_dimension': Kernel('map_dimension', BOX_SIZES, setup_boxes, {'scalar': map_dimension_scalar}),
+    'compute_box_3d': Kernel('compute_box_3d', BOX_SIZES, setup_boxes,
+                             {'scalar': compute_box_3d_scalar, 'batched': compute_box_3d_batched}),
+    'calc_alpha': Kernel('calc_alpha', BOX_SIZES, setup_boxes,
+                         {'scalar': calc_alpha_scalar, 'batched': calc_alpha_batched}),
+    'bat3d_to_kitti': Kernel('bat3d_to_kitti', BOX_SIZES, setup_boxes,
+                             {'scalar': bat3d_to_kitti_scalar, 'batched': bat3d_to_kitti_batched}),
+    'crop_range': Kernel('crop_range', POINT_SIZES, setup_points, {'batched': crop_range_batched}),
+    'crop_image': Kernel('crop_image', POINT_SIZES, setup_points, {'batched': crop_image_batched}),
+    'voxel_downsample': Kernel('voxel_downsample', POINT_SIZES, setup_points,
+                               {'mean': voxel_downsample_mean, 'first': voxel_downsample_first}),
+}
+
+
+def get_timing_key(kernel_name: str, variant: str, size: int) -> str:
+    return f'{kernel_name}[{variant}, n={size}]'
+
+
+def parse_timing_key(key: str) -> Tuple[str, str, int]:
+    kernel_name, params = key[:-1].split('[')
+    variant, size = params.split(', n=')
+    return kernel_name, variant, int(size)
+
+
+def time_call(fn: Callable[[], Any], repeats: int = 3) -> float:
+    '''Returns the best time of one call of `fn` in seconds, calls are looped so that a measure takes 0.2 s.'''
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeats, number)) / number
+
+
+def run_kernels(kernel_names: Optional[List[str]] = None, max_size: Optional[int] = None, repeats: int = 3,
+                seed: int = 0) -> Dict[str, float]:
+    '''Returns the time per call of every variant of every kernel and size, see `get_timing_key`.'''
+    timings = {}
+
+    for kernel_name in kernel_names or list(KERNELS):
+        kernel = KERNELS[kernel_name]
+
+        for size in kernel.sizes:
+            if max_size is not None and size > max_size:
+                continue
+
+            inputs = kernel.setup(size, np.random.default_rng(seed))
+
+            for variant, fn in kernel.variants.items():
+                timings[get_timing_key(kernel_name, variant, size)] = time_call(lambda: fn(inputs), repeats)
+
+    return timings
+
+
+def compare_timings(timings: Dict[str, float], baseline: Dict[str, float],
+                    threshold: float) -> List[Tuple[str, float, float]]:
+    '''Returns the (key, baseline time, time) of the timings slower than `threshold` times their baseline.'''
+    return [(key, baseline[key], timing) for key, timing in timings.items()
+            if key in baseline and timing > baseline[key] * threshold]
+
+
+def format_timings(timings: Dict[str, float], baseline: Optional[Dict[str, float]] = None) -> str:
+    '''Returns a table of `timings` with the speedup of every variant over the scalar one and the baseline ratio.'''
+    header = f'{"kernel":<44}{"time ms":>12}{"per item us":>14}{"vs scalar":>11}{"baseline ms":>14}{"ratio":>8}'
+    lines = [header, '-' * len(header)]
+
+    for key, timing in timings.items():
+        kernel_name, variant, size = parse_timing_key(key)
+        scalar_key = get_timing_key(kernel_name, 'scalar', size)
+        speedup = f'{timings[scalar_key] / timing:.1f}x' if variant != 'scalar' and scalar_key in timings else ''
+        line = f'{key:<44}{timing * 1e3:>12.3f}{timing / size * 1e6:>14.3f}{speedup:>11}'
+
+        if baseline and key in baseline:
+            line += f'{baseline[key] * 1e3:>14.3f}{timing / baseline[key]:>8.2f}'
+
+        lines.append(line)
+
+    return '\n'.join(lines)
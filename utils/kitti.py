@@ -1,4 +1,4 @@
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Type
 
 import numpy as np
 
@@ -72,3 +72,67 @@ def calc_alpha(location: Tuple[int, int, int], rotation_y: float) -> float:
     # wrap to +/-Pi
     alpha = np.arctan2(np.sin(alpha), np.cos(alpha))
     return alpha
+
+
+def roty_batch(t: np.ndarray, dtype: Type[np.floating] = np.float32) -> np.ndarray:
+    """ Rotations about the y-axis of N angles, (N,3,3). """
+    t = np.asarray(t, dtype=dtype).reshape(-1)
+    c = np.cos(t)
+    s = np.sin(t)
+    R = np.zeros((len(t), 3, 3), dtype=dtype)
+    R[:, 0, 0] = c
+    R[:, 0, 2] = s
+    R[:, 1, 1] = 1
+    R[:, 2, 0] = -s
+    R[:, 2, 2] = c
+    return R
+
+
+def project_to_image_batch(pts_3d: np.ndarray, P: np.ndarray) -> np.ndarray:
+    """ Project 3d points of any leading shape, (...,3), to the image plane, (...,2). """
+    pts_3d_extend = np.concatenate((pts_3d, np.ones(pts_3d.shape[:-1] + (1,), dtype=pts_3d.dtype)), axis=-1)
+    pts_2d = pts_3d_extend @ np.transpose(P[:3]).astype(pts_3d.dtype)
+    return pts_2d[..., 0:2] / pts_2d[..., 2:3]
+
+
+def compute_box_3d_batch(width: np.ndarray, height: np.ndarray, length: np.ndarray, location: np.ndarray,
+                         rotation_y: np.ndarray, P: np.ndarray,
+                         dtype: Type[np.floating] = np.float32) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Batched compute_box_3d of N boxes.
+        Returns:
+            corners_2d: (N,8,2) array in left image coord, only meaningful where valid.
+            corners_3d: (N,8,3) array in rect camera coord.
+            valid: (N,) bool array, False for boxes with a corner behind the camera.
+    """
+    width = np.asarray(width, dtype=dtype).reshape(-1, 1)
+    height = np.asarray(height, dtype=dtype).reshape(-1, 1)
+    length = np.asarray(length, dtype=dtype).reshape(-1, 1)
+    location = np.asarray(location, dtype=dtype).reshape(-1, 3)
+    rotation_y = np.asarray(rotation_y, dtype=dtype).reshape(-1, 1)
+
+    # 3d bounding box corners
+    x_corners = np.array([1, 1, -1, -1, 1, 1, -1, -1], dtype=dtype) * length / 2
+    y_corners = np.array([0, 0, 0, 0, -1, -1, -1, -1], dtype=dtype) * height
+    z_corners = np.array([1, -1, -1, 1, 1, -1, -1, 1], dtype=dtype) * width / 2
+
+    # rotate and translate 3d bounding box, R @ corners written out for the zeros of roty
+    c = np.cos(rotation_y)
+    s = np.sin(rotation_y)
+    corners_3d = np.stack((c * x_corners + s * z_corners, y_corners, -s * x_corners + c * z_corners), axis=2)
+    corners_3d += location[:, None]
+
+    valid = ~(corners_3d[..., 2] < 0.1).any(axis=1)
+
+    # Corners of invalid boxes may have a depth of 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corners_2d = project_to_image_batch(corners_3d, P)
+
+    return corners_2d, corners_3d, valid
+
+
+def calc_alpha_batch(location: np.ndarray, rotation_y: np.ndarray, dtype: Type[np.floating] = np.float32) -> np.ndarray:
+    """ Batched calc_alpha of N boxes, (N,). """
+    location = np.asarray(location, dtype=dtype).reshape(-1, 3)
+    rotation_y = np.asarray(rotation_y, dtype=dtype).reshape(-1)
+    alpha = rotation_y + np.arctan2(location[:, 2], location[:, 0]) + dtype(1.5 * np.pi)
+    return np.arctan2(np.sin(alpha), np.cos(alpha))
@@ -1,7 +1,9 @@
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple, TypeVar
 
 import numpy as np
 
+T = TypeVar('T')
+
 
 def homo_mat(transform_matrix: np.ndarray) -> np.ndarray:
     padding = (4 - transform_matrix.shape[0], 4 - transform_matrix.shape[1])
@@ -37,8 +39,43 @@ def point_3d_transfrom(points: np.ndarray, transform_matrix: np.ndarray) -> np.n
     return points
 
 
-def map_dimension(transform_matrix: np.ndarray, src_dim_map: Dict[str, float],
-                  dst_dim_map: Dict[str, str]) -> Tuple[float, float, float]:
+def affine_transform(points: np.ndarray, transform_matrix: np.ndarray, out: Optional[np.ndarray] = None,
+                     scratch: Optional[np.ndarray] = None) -> np.ndarray:
+    '''
+        Transforms x, y and z, the first 3 columns of (N, k) `points`, with `R @ p + t` in the dtype of `points`, the
+        other columns are kept. Unlike `point_3d_transfrom`, no homogeneous copy is made: the product is written
+        straight into `out`, except for points transformed in place with `out=points` where it goes through an (N, 3)
+        buffer first.
+
+        Args:
+            transform_matrix: (3, 4) or (4, 4) affine matrix.
+            out: (N, k) array to write the result to, a new one if None.
+            scratch: (N, 3) C-contiguous buffer of the dtype of `points` for in-place transforms, e.g. reused between
+                calls, a new one if None.
+    '''
+    assert len(points.shape) == 2 and points.shape[1] >= 3, points.shape
+    rotation = transform_matrix[:3, :3].T.astype(points.dtype)
+    translation = transform_matrix[:3, 3].astype(points.dtype)
+
+    if out is points:
+        # The product reads every coordinate of a point, it can not overwrite them as it goes
+        out[:, :3] = np.matmul(points[:, :3], rotation, out=scratch)
+    else:
+        if out is None:
+            out = np.empty(points.shape, dtype=points.dtype)
+
+        out[:, 3:] = points[:, 3:]
+        np.matmul(points[:, :3], rotation, out=out[:, :3])
+
+    # Column by column, adding to the strided (N, 3) view at once is several times slower
+    for axis in range(3):
+        out[:, axis] += translation[axis]
+
+    return out
+
+
+def map_dimension(transform_matrix: np.ndarray, src_dim_map: Dict[str, T],
+                  dst_dim_map: Dict[str, str]) -> Tuple[T, T, T]:
     '''
         Args:
             transform_matrix (np.ndarray): Transform matrix has shape of (3, 4).
@@ -2,10 +2,11 @@ import json
 from pathlib import Path
 
 import numpy as np
-from scipy.spatial.transform import Rotation as R
 
 
 def get_extrinsic_matrices(calib_path: str, cam_name: str) -> np.ndarray:
+    from scipy.spatial.transform import Rotation as R
+
     output_rig_map = {
         'reversed': [
             '210412',
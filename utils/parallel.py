@@ -0,0 +1,37 @@
+from collections import deque
+from concurrent.futures import (Executor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator
+
+EXECUTORS: Dict[str, Callable[..., Executor]] = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+def ordered_map(fn: Callable[..., Any], *iterables: Iterable, workers: int = 1, executor: str = 'thread',
+                prefetch: int = 2) -> Iterator[Any]:
+    '''
+        Lazy, order-preserving equivalent of `map` backed by a thread or process pool.
+
+        At most `workers * prefetch` items are in flight, so iterables (e.g. generators decoding frames) are
+        consumed progressively instead of being materialized like with `Executor.map`.
+    '''
+    if workers <= 1:
+        yield from map(fn, *iterables)
+        return
+
+    if executor not in EXECUTORS:
+        raise ValueError(f'Unsupported executor {executor}, expected one of {list(EXECUTORS)}.')
+
+    with EXECUTORS[executor](max_workers=workers) as pool:
+        futures: Deque[Future] = deque()
+
+        for args in zip(*iterables):
+            futures.append(pool.submit(fn, *args))
+
+            if len(futures) >= workers * prefetch:
+                yield futures.popleft().result()
+
+        while futures:
+            yield futures.popleft().result()
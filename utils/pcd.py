@@ -0,0 +1,170 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PCD_TYPES = {'F': 'f', 'I': 'i', 'U': 'u'}
+
+
+def parse_pcd_header(f: Any) -> Dict[str, Any]:
+    '''
+        Reads the header of a PCD file from the binary file object `f`, which is left at the start of the data.
+
+        Returns: Dict of the header entries, `fields`, `sizes`, `types` and `counts` are lists, `width`, `height`
+            and `points` are ints, `data` is 'ascii', 'binary' or 'binary_compressed'.
+    '''
+    header: Dict[str, Any] = {}
+
+    while 'data' not in header:
+        line = f.readline()
+
+        if not line:
+            raise ValueError('PCD header has no DATA line.')
+
+        line = line.decode('ascii').strip()
+
+        if not line or line.startswith('#'):
+            continue
+
+        key, *values = line.split()
+        header[key.lower()] = values
+
+    header['sizes'] = [int(size) for size in header['size']]
+    header['types'] = header['type']
+    header['counts'] = [int(count) for count in header.get('count', [1] * len(header['fields']))]
+    header['width'] = int(header['width'][0])
+    header['height'] = int(header.get('height', [1])[0])
+    header['points'] = int(header.get('points', [header['width'] * header['height']])[0])
+    header['data'] = header['data'][0].lower()
+    return header
+
+
+def get_pcd_dtype(header: Dict[str, Any]) -> np.dtype:
+    '''Returns the dtype of a point, fields with a count over 1 are subarrays.'''
+    return np.dtype([(field, f'<{PCD_TYPES[type_]}{size}', (count,))
+                     for field, size, type_, count in zip(header['fields'], header['sizes'], header['types'],
+                                                          header['counts'])])
+
+
+def lzf_decompress(data: bytes, size: int) -> bytes:
+    '''Decompresses an LZF block into `size` bytes, with python-lzf if installed.'''
+    try:
+        import lzf
+        return lzf.decompress(data, size)
+    except ImportError:
+        pass
+
+    out = bytearray(size)
+    i = 0
+    o = 0
+
+    while i < len(data):
+        ctrl = data[i]
+        i += 1
+
+        if ctrl < 32:
+            # Literal run
+            length = ctrl + 1
+            out[o:o + length] = data[i:i + length]
+            i += length
+        else:
+            # Back reference
+            length = ctrl >> 5
+
+            if length == 7:
+                length += data[i]
+                i += 1
+
+            length += 2
+            ref = o - ((ctrl & 0x1f) << 8) - data[i] - 1
+            i += 1
+
+            if ref < 0:
+                raise ValueError('Invalid LZF back reference.')
+
+            if ref + length <= o:
+                out[o:o + length] = out[ref:ref + length]
+            else:
+                # The reference overlaps the output, it repeats the last `o - ref` bytes
+                pattern = out[ref:o]
+                out[o:o + length] = (pattern * (length // len(pattern) + 1))[:length]
+
+        o += length
+
+    if o != size:
+        raise ValueError(f'LZF data decompressed to {o} bytes instead of {size}.')
+
+    return bytes(out)
+
+
+def get_columns(header: Dict[str, Any], fields: Optional[Sequence[str]] = None) -> List[Tuple[str, int]]:
+    '''Returns the (field, element) of each output column, all elements of all fields if `fields` is None.'''
+    counts = dict(zip(header['fields'], header['counts']))
+
+    if fields is None:
+        fields = header['fields']
+
+    for field in fields:
+        if field not in counts:
+            raise ValueError(f'Field {field} not in the PCD fields {header["fields"]}.')
+
+    return [(field, i) for field in fields for i in range(counts[field])]
+
+
+def read_pcd(pcd_file: str, fields: Optional[Sequence[str]] = None) -> np.ndarray:
+    '''
+        Reads a PCD file of any DATA type into a float32 (N, k) array.
+
+        Args:
+            fields: Fields to read in this order, e.g. ['x', 'y', 'z', 'intensity'], all fields if None. A field
+                with a count over 1 takes as many columns.
+    '''
+    path = Path(pcd_file)
+
+    with path.open(mode='rb') as f:
+        header = parse_pcd_header(f)
+        offset = f.tell()
+
+        dtype = get_pcd_dtype(header)
+        columns = get_columns(header, fields)
+        n_points = header['points']
+        point_cloud = np.empty((n_points, len(columns)), dtype=np.float32)
+
+        if n_points == 0:
+            return point_cloud
+
+        if header['data'] == 'binary':
+            # Each column is copied out of the page cache, the records are never loaded as a whole
+            records = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(n_points,))
+
+            for column, (field, i) in enumerate(columns):
+                point_cloud[:, column] = records[field][:, i]
+
+            del records
+        elif header['data'] == 'ascii':
+            values = np.loadtxt(f, dtype=np.float64, ndmin=2, max_rows=n_points)
+            starts = dict(zip(header['fields'], np.cumsum([0] + header['counts'][:-1]).tolist()))
+
+            for column, (field, i) in enumerate(columns):
+                point_cloud[:, column] = values[:, starts[field] + i]
+        elif header['data'] == 'binary_compressed':
+            compressed_size, size = np.frombuffer(f.read(8), dtype='<u4').tolist()
+            data = lzf_decompress(f.read(compressed_size), size)
+
+            # Fields are stored one after another, each as a (N, count) array
+            field_offsets = {}
+            field_offset = 0
+
+            for field in header['fields']:
+                field_offsets[field] = field_offset
+                field_offset += n_points * dtype[field].itemsize
+
+            for column, (field, i) in enumerate(columns):
+                field_dtype = dtype[field]
+                values = np.frombuffer(data, dtype=field_dtype.base, count=n_points * field_dtype.shape[0],
+                                       offset=field_offsets[field])
+                point_cloud[:, column] = values.reshape(n_points, -1)[:, i]
+        else:
+            raise ValueError(f'Unsupported PCD data type {header["data"]}.')
+
+    return point_cloud
@@ -0,0 +1,207 @@
+from typing import Sequence, Tuple, Type, Union
+
+import numpy as np
+
+
+def crop_range(points: np.ndarray, point_cloud_range: Sequence[float]) -> np.ndarray:
+    '''
+        Keeps the points of a (N, k) array inside an axis-aligned box.
+
+        Args:
+            point_cloud_range: x_min, y_min, z_min, x_max, y_max and z_max, the min bounds are inclusive and the max
+                bounds exclusive as in the `PointsRangeFilter` of mmdet3d.
+    '''
+    mask = np.ones(len(points), dtype=bool)
+
+    # Column by column, a (N, 3) comparison with np.all is several times slower
+    for axis in range(3):
+        column = points[:, axis]
+        mask &= column >= points.dtype.type(point_cloud_range[axis])
+        mask &= column < points.dtype.type(point_cloud_range[axis + 3])
+
+    return points[mask]
+
+
+def crop_image(points: np.ndarray, projection_matrix: np.ndarray, image_size: Tuple[int, int],
+               margin: float = 0) -> np.ndarray:
+    '''
+        Keeps the points of a (N, k) array in front of a camera whose projection is inside the image.
+
+        Args:
+            projection_matrix: (3, 4) matrix from the frame of the points to the image.
+            image_size: (width, height) of the image.
+            margin: Pixels the image bounds are extended with on every side.
+    '''
+    projection_matrix = projection_matrix.astype(points.dtype)
+    uvw = points[:, :3] @ projection_matrix[:, :3].T
+    uvw += projection_matrix[:, 3]
+    depth = uvw[:, 2]
+    mask = depth > 0
+
+    # u / w and v / w are compared with the bounds scaled by w, points in front of the camera have w > 0
+    for axis, size in enumerate(image_size):
+        coords = uvw[:, axis]
+        mask &= coords >= -margin * depth
+        mask &= coords < (size + margin) * depth
+
+    return points[mask]
+
+
+def voxel_downsample(points: np.ndarray, voxel_size: Union[float, Sequence[float]], reduce: str = 'mean') -> np.ndarray:
+    '''
+        Keeps one point per voxel of a (N, k) array, in the order of the first point of each voxel. Points with a
+        non-finite x, y or z belong to no voxel and are dropped.
+
+        Args:
+            voxel_size: Size of the voxels along x, y and z, or one size for all of them.
+            reduce: 'mean' to average all the features of the points of a voxel, 'first' to keep its first point.
+    '''
+    if reduce not in ('mean', 'first'):
+        raise ValueError(f'Unsupported voxel reduction {reduce}.')
+
+    finite = np.isfinite(points[:, :3]).all(axis=1)
+
+    if not finite.all():
+        points = points[finite]
+
+    if len(points) == 0:
+        return points
+
+    voxels = np.floor(points[:, :3] / np.asarray(voxel_size, dtype=points.dtype)).astype(np.int64)
+    voxels -= voxels.min(axis=0)
+    keys = np.ravel_multi_index(voxels.T, tuple(voxels.max(axis=0) + 1))
+
+    # Points are grouped by voxel with an unstable sort, which is several times faster than the stable one of
+    # np.unique(return_index=True), the first point of a voxel is then the min index of its group
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    is_start = np.empty(len(keys), dtype=bool)
+    is_start[0] = True
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=is_start[1:])
+    starts = np.flatnonzero(is_start)
+    first_indices = np.minimum.reduceat(order, starts)
+
+    # Voxels are put back in the order the points come in
+    voxel_order = np.argsort(first_indices)
+
+    if reduce == 'first':
+        return points[first_indices[voxel_order]]
+
+    inverse = np.empty(len(keys), dtype=np.int64)
+    inverse[order] = np.cumsum(is_start) - 1
+    counts = np.diff(np.append(starts, len(keys)))
+    means = np.empty((len(starts), points.shape[1]), dtype=points.dtype)
+
+    for column in range(points.shape[1]):
+        means[:, column] = np.bincount(inverse, weights=points[:, column]) / counts
+
+    return means[voxel_order]
+
+
+COMPRESSIONS = ('quantized', 'zlib', 'lzma')
+COMPACT_MAGIC = b'CBIN'
+COMPACT_SUFFIX = '.cbin'
+COMPACT_HEADER = np.dtype([('magic', 'S4'), ('compression', '<u1'), ('n_feature', '<u1'), ('reserved', '<u2'),
+                           ('n_points', '<u4')])
+
+
+def quantize(values: np.ndarray, dtype: Type[np.integer]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+        Maps every column of `values` linearly to the full range of the integer `dtype`. Returns the quantized
+        values, the scale and the offset of each column, `dequantize` maps them back.
+    '''
+    info = np.iinfo(dtype)
+    lower = values.min(axis=0).astype(np.float64)
+    upper = values.max(axis=0).astype(np.float64)
+    scale = (upper - lower) / (int(info.max) - int(info.min))
+    scale[scale == 0] = 1.0
+    quantized = (np.round((values - lower) / scale) + info.min).clip(info.min, info.max).astype(dtype)
+    return quantized, scale.astype(np.float32), lower.astype(np.float32)
+
+
+def dequantize(quantized: np.ndarray, scale: np.ndarray, offset: np.ndarray, out: np.ndarray) -> np.ndarray:
+    # The offset is the min of each column, it is added last so small coordinates keep their precision
+    out[:] = quantized
+    out -= np.iinfo(quantized.dtype).min
+    out *= scale
+    out += offset
+    return out
+
+
+def encode_compact(points: np.ndarray, compression: str) -> bytes:
+    '''
+        Encodes a float32 (N, k) array, k < 256, as bytes of the compact velodyne format, `decode_compact` decodes
+        them. The header is followed by:
+            'quantized': float32 scale and offset of each column, x, y and z as int16, the other features as uint8,
+                about 0.4 of the float32 size with a precision of 1 / 65535 of the extent of the frame along each axis.
+            'zlib' and 'lzma': the float32 array compressed, lossless. Columns are stored one after another and their
+                bytes are shuffled into 4 planes, sign and exponent bytes then compress well, e.g. 0.8 of the float32
+                size with zlib instead of 0.93 unshuffled.
+    '''
+    if compression not in COMPRESSIONS:
+        raise ValueError(f'Unsupported compression {compression}, expected one of {COMPRESSIONS}.')
+
+    points = np.ascontiguousarray(points, dtype=np.float32)
+    header = np.array((COMPACT_MAGIC, COMPRESSIONS.index(compression), points.shape[1], 0, len(points)),
+                      dtype=COMPACT_HEADER)
+
+    if compression == 'quantized':
+        if len(points) == 0:
+            body = b''
+        else:
+            xyz, xyz_scale, xyz_offset = quantize(points[:, :3], np.int16)
+            features, feature_scale, feature_offset = quantize(points[:, 3:], np.uint8)
+            body = b''.join([np.concatenate((xyz_scale, feature_scale)).tobytes(),
+                             np.concatenate((xyz_offset, feature_offset)).tobytes(), xyz.tobytes(), features.tobytes()])
+    else:
+        shuffled = np.ascontiguousarray(points.T).view(np.uint8).reshape(-1, 4).T.tobytes()
+
+        if compression == 'zlib':
+            import zlib
+            body = zlib.compress(shuffled)
+        else:
+            import lzma
+            body = lzma.compress(shuffled)
+
+    return header.tobytes() + body
+
+
+def decode_compact_header(buffer: bytes) -> Tuple[str, int, int]:
+    '''Returns the compression, the number of features and the number of points of bytes of `encode_compact`.'''
+    header = np.frombuffer(buffer, dtype=COMPACT_HEADER, count=1)[0]
+
+    if header['magic'] != COMPACT_MAGIC:
+        raise ValueError('Not a compact velodyne buffer.')
+
+    return COMPRESSIONS[header['compression']], int(header['n_feature']), int(header['n_points'])
+
+
+def decode_compact(buffer: bytes) -> np.ndarray:
+    '''Decodes bytes of `encode_compact` back to a float32 (N, k) array.'''
+    compression, n_feature, n_points = decode_compact_header(buffer)
+    body = memoryview(buffer)[COMPACT_HEADER.itemsize:]
+
+    if compression == 'quantized':
+        points = np.empty((n_points, n_feature), dtype=np.float32)
+
+        if n_points == 0:
+            return points
+
+        scale, offset = np.frombuffer(body, dtype=np.float32, count=2 * n_feature).reshape(2, n_feature)
+        start = 2 * n_feature * 4
+        xyz = np.frombuffer(body, dtype=np.int16, count=3 * n_points, offset=start).reshape(n_points, 3)
+        start += xyz.nbytes
+        features = np.frombuffer(body, dtype=np.uint8, count=(n_feature - 3) * n_points,
+                                 offset=start).reshape(n_points, n_feature - 3)
+        dequantize(xyz, scale[:3], offset[:3], points[:, :3])
+        dequantize(features, scale[3:], offset[3:], points[:, 3:])
+        return points
+    elif compression == 'zlib':
+        import zlib
+        raw = zlib.decompress(body)
+    else:
+        import lzma
+        raw = lzma.decompress(body)
+
+    columns = np.frombuffer(raw, dtype=np.uint8).reshape(4, -1).T.copy().view(np.float32)
+    return np.ascontiguousarray(columns.reshape(n_feature, n_points).T)
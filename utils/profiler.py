@@ -0,0 +1,99 @@
+import time
+from contextlib import contextmanager
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+from dto.seq.profile import PhaseProfile, SeqProfile, StageProfile
+
+PHASES = ('in_adapter', 'preprocess', 'processor', 'postprocess', 'out_adapter')
+
+
+def io_counters() -> Tuple[int, int]:
+    '''Returns the bytes read and written by the process so far, zeros where /proc is not available.'''
+    counters = {}
+
+    try:
+        with open('/proc/self/io', mode='r', encoding='utf-8') as f:
+            for line in f:
+                key, value = line.split(':')
+                counters[key] = int(value)
+    except OSError:
+        pass
+
+    return counters.get('rchar', 0), counters.get('wchar', 0)
+
+
+@contextmanager
+def measure(stage_profile: Optional[StageProfile], phase: str) -> Iterator[None]:
+    '''
+        Adds the wall time, CPU time and bytes read and written while the block runs to `phase` of `stage_profile`,
+        nothing is measured if it is None. CPU time and bytes are counted for the whole process, so they include
+        other stages running at the same time with the dag execution.
+    '''
+    if stage_profile is None:
+        yield
+        return
+
+    wall_time, cpu_time = time.perf_counter(), time.process_time()
+    read_bytes, write_bytes = io_counters()
+
+    try:
+        yield
+    finally:
+        end_read_bytes, end_write_bytes = io_counters()
+        phase_profile = stage_profile.phases.setdefault(phase, PhaseProfile())
+        phase_profile.add(time.perf_counter() - wall_time, time.process_time() - cpu_time,
+                          end_read_bytes - read_bytes, end_write_bytes - write_bytes)
+
+
+def measured(stage_profile: Optional[StageProfile], phase: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args: Any) -> Any:
+        with measure(stage_profile, phase):
+            return fn(*args)
+
+    return wrapper
+
+
+def sum_stages(stage_profiles: Iterable[Dict[str, StageProfile]]) -> Dict[str, StageProfile]:
+    '''Returns the phases and frames of every stage summed over `stage_profiles`.'''
+    stages: Dict[str, StageProfile] = {}
+
+    for stage_profile in stage_profiles:
+        for stage_name, stage in stage_profile.items():
+            total = stages.setdefault(stage_name, StageProfile())
+            total.frames += stage.frames
+
+            for phase_name, phase in stage.phases.items():
+                total_phase = total.phases.setdefault(phase_name, PhaseProfile())
+                total_phase.add(phase.wall_time, phase.cpu_time, phase.read_bytes, phase.write_bytes, phase.calls)
+
+    return stages
+
+
+def format_stages(stages: Dict[str, StageProfile]) -> str:
+    '''Returns a table of the phases of every stage of `stages`, slowest stages first.'''
+    stage_times = {stage_name: sum(phase.wall_time for phase in stage.phases.values())
+                   for stage_name, stage in stages.items()}
+    total_time = sum(stage_times.values()) or 1.0
+    header = f'{"stage":<24}{"phase":<14}{"wall s":>10}{"cpu s":>10}{"share":>8}{"frames/s":>10}' \
+             f'{"read MB":>10}{"write MB":>10}'
+    lines = [header, '-' * len(header)]
+
+    for stage_name in sorted(stage_times, key=lambda name: stage_times[name], reverse=True):
+        stage = stages[stage_name]
+        stage_phases = sorted(stage.phases.items(),
+                              key=lambda item: PHASES.index(item[0]) if item[0] in PHASES else len(PHASES))
+
+        for phase_name, phase in stage_phases:
+            fps = stage.frames / phase.wall_time if phase.wall_time > 0 else 0.0
+            lines.append(f'{stage_name:<24}{phase_name:<14}{phase.wall_time:>10.3f}{phase.cpu_time:>10.3f}'
+                         f'{phase.wall_time / total_time:>8.1%}{fps:>10.1f}'
+                         f'{phase.read_bytes / 1e6:>10.1f}{phase.write_bytes / 1e6:>10.1f}')
+
+    return '\n'.join(lines)
+
+
+def format_summary(profiles: List[SeqProfile]) -> str:
+    '''Returns a table of the phases of every stage summed over `profiles`, slowest stages first.'''
+    stages = sum_stages(profile.stages for profile in profiles)
+    return f'{len(profiles)} sequences\n{format_stages(stages)}'
@@ -0,0 +1,43 @@
+import threading
+from typing import Any, Dict, Hashable, Tuple, Type
+
+# (module, class, kwargs) -> instance
+_instances: Dict[Tuple[str, str, Hashable], Any] = {}
+_lock = threading.Lock()
+
+
+def _freeze(obj: Any) -> Hashable:
+    # Raises TypeError for values which can not be compared by key, e.g. arrays whose repr is truncated
+    if isinstance(obj, dict):
+        return tuple(sorted((key, _freeze(value)) for key, value in obj.items()))
+    elif isinstance(obj, (list, tuple)):
+        return tuple(_freeze(element) for element in obj)
+
+    hash(obj)
+    return obj
+
+
+def create(cls: Type[Any], kwargs: Dict[str, Any]) -> Any:
+    '''
+        Returns `cls(**kwargs)`, shared by every call with the same class and kwargs in the process if the class has
+        a truthy `shared` attribute, e.g. stateless processors and adapters, so that identical modes of several stages
+        load their resources (models, ...) once. Instances are not shared if a kwarg is unhashable.
+    '''
+    if not getattr(cls, 'shared', False):
+        return cls(**kwargs)
+
+    try:
+        key = (cls.__module__, cls.__qualname__, _freeze(kwargs))
+    except TypeError:
+        return cls(**kwargs)
+
+    with _lock:
+        if key not in _instances:
+            _instances[key] = cls(**kwargs)
+
+        return _instances[key]
+
+
+def clear() -> None:
+    with _lock:
+        _instances.clear()
@@ -0,0 +1,196 @@
+import math
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import yaml
+
+from converter import Converter
+from dto.benchmark.report import BenchmarkReport
+from utils.benchmark import run_benchmark
+from utils.synthetic import make_delivery
+
+REGRESSION_DIR = Path(__file__).parents[1].joinpath('regression')
+GOLDEN_DIR = REGRESSION_DIR.joinpath('goldens')
+BUDGET_FILE = REGRESSION_DIR.joinpath('budgets.yaml')
+
+# Small enough for the goldens to be stored in the repo, dense enough to cover truncated and hidden boxes
+DATASET: Dict[str, Any] = {
+    'n_seqs': 1,
+    'n_frames': 3,
+    'n_points': 2000,
+    'n_instances': 8,
+    'image_size': (320, 180),
+    'seed': 0,
+}
+DATA_DIR_PLACEHOLDER = '$DATA_DIR'
+
+TEXT_SUFFIXES = ('.txt', '.json', '.xml', '.yaml')
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg')
+RTOL = 1e-6
+ATOL = 1e-6
+BIN_ATOL = 1e-5
+IMAGE_ATOL = 1.0  # mean absolute difference of the pixels, jpeg codecs differ slightly between versions
+
+
+def make_dataset(data_dir: str) -> List[str]:
+    shutil.rmtree(data_dir, ignore_errors=True)
+    return make_delivery(data_dir, **DATASET)
+
+
+def list_files(root_dir: Path) -> List[str]:
+    # Dot folders hold the manifests and profiles of the converter
+    return sorted(file.relative_to(root_dir).as_posix() for file in root_dir.rglob('*')
+                  if file.is_file() and not any(part.startswith('.') for part in file.relative_to(root_dir).parts))
+
+
+def read_text(file: Path, data_dir: Optional[str] = None) -> str:
+    text = file.read_text(encoding='utf-8')
+    return text.replace(data_dir, DATA_DIR_PLACEHOLDER) if data_dir is not None else text
+
+
+def compare_tokens(golden: str, output: str) -> bool:
+    if golden == output:
+        return True
+
+    try:
+        return math.isclose(float(golden), float(output), rel_tol=RTOL, abs_tol=ATOL)
+    except ValueError:
+        return False
+
+
+def compare_text(golden: str, output: str) -> Optional[str]:
+    golden_lines = golden.splitlines()
+    output_lines = output.splitlines()
+
+    if len(golden_lines) != len(output_lines):
+        return f'{len(output_lines)} lines instead of {len(golden_lines)}'
+
+    for i, (golden_line, output_line) in enumerate(zip(golden_lines, output_lines)):
+        # Numbers are compared with tolerances, e.g. KITTI labels, calib matrices and YOLO coordinates
+        golden_tokens = golden_line.replace(',', ' , ').split()
+        output_tokens = output_line.replace(',', ' , ').split()
+
+        if len(golden_tokens) != len(output_tokens) or not all(map(compare_tokens, golden_tokens, output_tokens)):
+            return f'line {i + 1} differs:\n    golden: {golden_line}\n    output: {output_line}'
+
+    return None
+
+
+def compare_file(golden_file: Path, output_file: Path, data_dir: str) -> Optional[str]:
+    '''Returns why `output_file` does not match `golden_file`, None if it matches.'''
+    suffix = golden_file.suffix.lower()
+
+    if suffix in TEXT_SUFFIXES:
+        return compare_text(read_text(golden_file), read_text(output_file, data_dir))
+    elif suffix == '.bin':
+        golden = np.fromfile(golden_file, dtype=np.float32)
+        output = np.fromfile(output_file, dtype=np.float32)
+
+        if golden.shape != output.shape:
+            return f'{output.size} values instead of {golden.size}'
+
+        if not np.allclose(golden, output, rtol=RTOL, atol=BIN_ATOL):
+            return f'values differ by up to {np.abs(golden - output).max()}'
+    elif suffix in IMAGE_SUFFIXES:
+        import cv2
+
+        golden = cv2.imread(str(golden_file))
+        output = cv2.imread(str(output_file))
+
+        if golden.shape != output.shape:
+            return f'shape {output.shape} instead of {golden.shape}'
+
+        diff = np.abs(golden.astype(np.float32) - output.astype(np.float32)).mean()
+
+        if diff > IMAGE_ATOL:
+            return f'pixels differ by {diff:.2f} on average'
+    elif golden_file.read_bytes() != output_file.read_bytes():
+        return 'content differs'
+
+    return None
+
+
+def compare_dirs(golden_dir: Path, out_dir: Path, data_dir: str) -> List[str]:
+    '''Returns the mismatches between the files of `out_dir` and the goldens of `golden_dir`.'''
+    golden_files = list_files(golden_dir)
+    output_files = list_files(out_dir)
+    errors = [f'{file}: missing' for file in golden_files if file not in output_files]
+    errors += [f'{file}: not in goldens' for file in output_files if file not in golden_files]
+
+    for file in golden_files:
+        if file in output_files:
+            error = compare_file(golden_dir.joinpath(file), out_dir.joinpath(file), data_dir)
+
+            if error is not None:
+                errors.append(f'{file}: {error}')
+
+    return errors
+
+
+def compare_outputs(out_dir: Path, other_out_dir: Path) -> List[str]:
+    '''Returns the files of `out_dir` and `other_out_dir` which are not identical, byte for byte.'''
+    files = list_files(out_dir)
+    other_files = list_files(other_out_dir)
+    errors = [f'{file}: missing' for file in files if file not in other_files]
+    errors += [f'{file}: not in {out_dir}' for file in other_files if file not in files]
+
+    for file in files:
+        if file in other_files and out_dir.joinpath(file).read_bytes() != other_out_dir.joinpath(file).read_bytes():
+            errors.append(f'{file}: content differs')
+
+    return errors
+
+
+def convert(config_path: str, seq_dirs: List[str], out_dir: str, execution: str) -> None:
+    shutil.rmtree(out_dir, ignore_errors=True)
+    converter = Converter(config_path, execution=execution)
+
+    for seq_dir in seq_dirs:
+        converter(seq_dir, out_dir)
+
+
+def update_goldens(golden_dir: Path, out_dir: Path, data_dir: str) -> None:
+    shutil.rmtree(golden_dir, ignore_errors=True)
+
+    for file in list_files(out_dir):
+        golden_file = golden_dir.joinpath(file)
+        golden_file.parent.mkdir(parents=True, exist_ok=True)
+
+        if golden_file.suffix.lower() in TEXT_SUFFIXES:
+            golden_file.write_text(read_text(out_dir.joinpath(file), data_dir), encoding='utf-8')
+        else:
+            shutil.copyfile(out_dir.joinpath(file), golden_file)
+
+
+def load_budgets() -> Dict[str, Dict[str, float]]:
+    with BUDGET_FILE.open(mode='r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+def check_budget(report: BenchmarkReport, budget: Dict[str, float]) -> List[str]:
+    '''
+        Returns the budgets exceeded by `report`, `budget` has the best wall time in seconds (`wall_time`) and the
+        peak resident memory in MB (`peak_rss`) allowed.
+    '''
+    errors = []
+    wall_time = report.best_run.wall_time
+    peak_rss = report.peak_rss / 1e6
+
+    if 'wall_time' in budget and wall_time > budget['wall_time']:
+        errors.append(f'wall time {wall_time:.3f} s over the budget of {budget["wall_time"]} s')
+
+    if 'peak_rss' in budget and peak_rss > budget['peak_rss']:
+        errors.append(f'peak RSS {peak_rss:.1f} MB over the budget of {budget["peak_rss"]} MB')
+
+    return errors
+
+
+def benchmark_config(config_path: str, seq_dirs: List[str], out_dir: str, repeats: int = 2) -> BenchmarkReport:
+    '''Converts `seq_dirs` with `config_path` in a fresh process, so that the peak memory is the one of the config.'''
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        future = executor.submit(run_benchmark, config_path, seq_dirs, out_dir, repeats)
+        return future.result()
@@ -0,0 +1,140 @@
+import argparse
+import subprocess
+import sys
+import traceback
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from tqdm import tqdm
+
+from converter import EXECUTIONS, Converter
+from dto.seq.profile import SeqProfile
+from utils.common import open_file
+from utils.profiler import format_summary
+
+RUNNER_ARGS = ('workers', 'execution', 'incremental', 'content_hash', 'profile', 'import_time')
+
+_converter: Optional[Converter] = None
+
+
+def add_runner_args(parser: argparse.ArgumentParser, incremental: bool = False) -> None:
+    '''
+        Args:
+            incremental: Whether to add the incremental arguments, for scripts whose sequences are converted into
+                their own folder of out_dir.
+    '''
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Number of worker processes, each one builds its own Converter.')
+    parser.add_argument('--execution', choices=EXECUTIONS, default='sequential',
+                        help='Execution of the stages of a sequence, see Converter.')
+    parser.add_argument('--profile', action='store_true',
+                        help='Write a timing report per sequence and print a summary of the stages at the end.')
+    parser.add_argument('--import-time', action='store_true',
+                        help='Print the slowest imports of building the Converter before converting.')
+
+    if incremental:
+        parser.add_argument('--incremental', '-i', action='store_true',
+                            help='Skip sequences whose inputs and config did not change since the last run.')
+        parser.add_argument('--content-hash', action='store_true',
+                            help='Fingerprint input files by content instead of size and mtime.')
+
+
+def get_runner_kwargs(args: argparse.Namespace) -> Dict[str, Any]:
+    '''Returns the arguments added by `add_runner_args` to be passed to `run_converter`.'''
+    return {key: getattr(args, key) for key in RUNNER_ARGS if hasattr(args, key)}
+
+
+def format_import_time(config_path: str, top: int = 15) -> str:
+    '''
+        Builds a Converter of `config_path` in a fresh interpreter with `python -X importtime` and returns the total
+        import time and the `top` packages taking the most of it, summing the self time of their modules.
+    '''
+    code = 'import sys; sys.path.insert(0, sys.argv[1]); from converter import Converter; Converter(sys.argv[2])'
+    args = [sys.executable, '-X', 'importtime', '-c', code, str(Path(__file__).parents[1]),
+            str(Path(config_path).resolve())]
+    process = subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    packages: Dict[str, int] = defaultdict(int)
+
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        self_time, _, name = line[len('import time:'):].split('|')
+        packages[name.strip().split('.')[0]] += int(self_time)
+
+    lines = [f'import time {sum(packages.values()) / 1e6:.3f} s']
+    lines += [f'{self_time / 1e6:>10.3f} s  {package}'
+              for package, self_time in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]]
+    return '\n'.join(lines)
+
+
+def _init_worker(config_path: str, converter_kwargs: Dict[str, Any]) -> None:
+    global _converter
+    _converter = Converter(config_path, **converter_kwargs)
+
+
+def _convert(seq_dir: str, out_dir: str) -> Tuple[str, Optional[str], bool]:
+    '''Returns the sequence, its error if it failed and whether it was converted, i.e. neither failed nor skipped.'''
+    assert _converter is not None
+
+    try:
+        # Up-to-date sequences of incremental conversions are skipped and return None
+        converted = _converter(seq_dir, out_dir) is not None
+    except Exception as e:
+        error = f'{datetime.now()}: Error while converting {seq_dir}, {e}\n{traceback.format_exc()}\n'
+        return seq_dir, error, False
+
+    return seq_dir, None, converted
+
+
+def _log_errors(results: Iterable[Tuple[str, Optional[str], bool]], log_file: str) -> List[str]:
+    '''Appends the errors of `results` to `log_file` and returns the sequences converted in this run.'''
+    converted_dirs = []
+
+    for seq_dir, error, converted in results:
+        if error is not None:
+            with open_file(log_file, mode='a', encoding='utf-8') as f:
+                f.write(error)
+
+        if converted:
+            converted_dirs.append(seq_dir)
+
+    return converted_dirs
+
+
+def _print_profile_summary(seq_dirs: List[str], out_dir: str) -> None:
+    profiles = [SeqProfile.fromfile(str(SeqProfile.get_file(out_dir, Path(seq_dir).name))) for seq_dir in seq_dirs]
+    profiles = [profile for profile in profiles if profile is not None]
+
+    if profiles:
+        print(format_summary(profiles))
+
+
+def run_converter(config_path: str, seq_dirs: List[str], out_dir: str, workers: int = 1, log_file: str = 'log.txt',
+                  import_time: bool = False, **converter_kwargs: Any) -> None:
+    '''
+        Converts every sequence of `seq_dirs` into `out_dir`.
+
+        With `workers` > 1, sequences are scheduled over a process pool where each worker builds one Converter with
+        `converter_kwargs`. Errors are captured per sequence and appended to `log_file` by the main process.
+    '''
+    if import_time:
+        print(format_import_time(config_path))
+
+    convert = partial(_convert, out_dir=out_dir)
+
+    if workers > 1:
+        with Pool(workers, initializer=_init_worker, initargs=(config_path, converter_kwargs)) as pool:
+            results = pool.imap_unordered(convert, seq_dirs)
+            converted_dirs = _log_errors(tqdm(results, total=len(seq_dirs)), log_file)
+    else:
+        _init_worker(config_path, converter_kwargs)
+        converted_dirs = _log_errors(tqdm(map(convert, seq_dirs), total=len(seq_dirs)), log_file)
+
+    # Profiles of skipped sequences are the ones of the run which converted them
+    if converter_kwargs.get('profile'):
+        _print_profile_summary(converted_dirs, out_dir)
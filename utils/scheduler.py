@@ -0,0 +1,170 @@
+import copy
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import ExitStack
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from abstract.processor import FrameStream
+from abstract.stage import Stage
+from dto.seq.seq_info import SeqInfo
+from utils.parallel import EXECUTORS
+
+
+class StageNode:
+    '''
+        Node of the stage graph: a whole stage ('run'), or the two halves of a streamable stage, 'open' which
+        resolves the frames of the sequence and 'close' which processes them.
+    '''
+
+    def __init__(self, name: str, stage: Stage, phase: str = 'run'):
+        self.name = name if phase == 'run' else f'{name}:{phase}'
+        self.stage_name = name
+        self.stage = stage
+        self.phase = phase
+        self.dependencies: Set[str] = set()
+
+        open_writes = tuple(field for field in stage.writes or () if field in stage.open_writes)
+        close_writes = tuple(field for field in stage.writes or () if field not in stage.open_writes)
+
+        # Undeclared stages have no fields, they depend on every other node instead
+        self.reads: Tuple[str, ...] = tuple(stage.reads or ()) if phase != 'close' else ()
+        self.writes: Tuple[str, ...] = {'run': tuple(stage.writes or ()), 'open': open_writes,
+                                        'close': close_writes}[phase]
+
+    @property
+    def declared(self) -> bool:
+        return self.stage.declared
+
+
+def _overlap(fields: Iterable[str], other_fields: Iterable[str]) -> bool:
+    # `frame_infos` overlaps with `frame_infos.<field>`
+    return any(field == other or field.startswith(f'{other}.') or other.startswith(f'{field}.')
+               for field in fields for other in other_fields)
+
+
+def build_stage_graph(stages: Dict[str, Stage]) -> List[StageNode]:
+    '''
+        Returns the nodes of `stages` in config order with their dependencies: the earlier nodes writing a field
+        they read, and every earlier node for undeclared stages (and the other way around).
+
+        Write-after-read and write-after-write need no edge since every node runs on its own copy of `SeqInfo`,
+        they are handled when writes are merged back, see `run_stage_graph`.
+    '''
+    nodes: List[StageNode] = []
+
+    for name, stage in stages.items():
+        # Streams hold generators which can not be sent to another process
+        if stage.declared and stage.streamable and stage.executor == 'thread':
+            stage_nodes = [StageNode(name, stage, 'open'), StageNode(name, stage, 'close')]
+        else:
+            stage_nodes = [StageNode(name, stage)]
+
+        for node in stage_nodes:
+            for prev_node in nodes:
+                if not node.declared or not prev_node.declared or _overlap(prev_node.writes, node.reads):
+                    node.dependencies.add(prev_node.name)
+
+            nodes.append(node)
+
+        if len(stage_nodes) == 2:
+            stage_nodes[1].dependencies.add(stage_nodes[0].name)
+
+    return nodes
+
+
+def _can_merge(node: StageNode, unmerged: List[StageNode]) -> bool:
+    # Every `frame_infos.<field>` may add frames, so they are merged in config order to keep frames in order
+    writes = {field.split('.')[0] for field in node.writes}
+    return all(prev_node.declared and not _overlap(writes, prev_node.reads + prev_node.writes)
+               for prev_node in unmerged)
+
+
+def run_stage_graph(nodes: List[StageNode], seq_info: SeqInfo) -> Tuple:
+    '''
+        Runs every node as soon as its dependencies are merged. Declared nodes run on a copy of `seq_info` in the
+        pool given by `Stage.executor`, and their writes are merged back as soon as no earlier unmerged node reads or
+        writes the same fields, so the result is the one of the sequential execution whatever order nodes finish in.
+        Undeclared stages run alone on `seq_info`.
+    '''
+    output: Tuple = (seq_info,)
+    results: Dict[str, Any] = {}
+    streams: Dict[str, FrameStream] = {}
+    futures: Dict[Future, StageNode] = {}
+    submitted: Set[str] = set()
+    merged: Set[str] = set()
+
+    with ExitStack() as stack:
+        executors = {executor: stack.enter_context(EXECUTORS[executor]())
+                     for executor in {node.stage.executor for node in nodes if node.declared}}
+
+        while len(merged) < len(nodes):
+            progress = False
+
+            for node in nodes:
+                # The close node only needs the stream of the open node, not its writes to be merged
+                dependencies = node.dependencies - set(streams) if node.phase == 'close' else node.dependencies
+
+                if node.name in submitted or not dependencies <= merged:
+                    continue
+
+                stage = node.stage
+                submitted.add(node.name)
+                progress = True
+
+                # Undeclared stages depend on every earlier node, so they get the output of the previous one
+                if not node.declared:
+                    results[node.name] = stage(*output)
+                    continue
+
+                executor = executors[stage.executor]
+
+                if node.phase == 'run':
+                    future = executor.submit(stage, copy.deepcopy(seq_info))
+                elif node.phase == 'open':
+                    future = executor.submit(stage.open_stream, copy.deepcopy(seq_info))
+                else:
+                    stream = streams[f'{node.stage_name}:open']
+                    future = executor.submit(stream.close, stage.processor.map_frames)
+
+                futures[future] = node
+
+            for i, node in enumerate(nodes):
+                if node.name in merged or node.name not in results:
+                    continue
+
+                unmerged = [prev_node for prev_node in nodes[:i] if prev_node.name not in merged]
+
+                if unmerged and not _can_merge(node, unmerged):
+                    continue
+
+                result = results.pop(node.name)
+
+                if node.declared:
+                    seq_info.merge(result[0], node.writes)
+                    output = (seq_info,)
+
+                    if seq_info.profile is not None and node.stage_name in result[0].profile:
+                        seq_info.profile[node.stage_name] = result[0].profile[node.stage_name]
+                else:
+                    output = result
+
+                merged.add(node.name)
+                progress = True
+
+            if not progress:
+                # Nothing can be submitted or merged and nothing is running, waiting would never return
+                if not futures:
+                    pending = [node.name for node in nodes if node.name not in merged]
+                    raise RuntimeError(f'Stage graph is deadlocked, nodes {pending} can never run.')
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                for done_future in done:
+                    node = futures.pop(done_future)
+
+                    if node.phase == 'open':
+                        streams[node.name] = done_future.result()
+                        results[node.name] = streams[node.name].output
+                    else:
+                        results[node.name] = done_future.result()
+
+    return output
@@ -0,0 +1,309 @@
+import json
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from dto.bat3d.frame import Frame as BAT3DFrame
+from dto.bat3d.instance import Instance as BAT3DInstance
+from dto.bat3d.label import Label as BAT3DLabel
+from dto.cvat.attrib import Attrib as CVATAttrib
+from dto.cvat.frame import Frame as CVATFrame
+from dto.cvat.instance import Instance as CVATInstance
+from dto.cvat.label import Label as CVATLabel
+from dto.scale_ai.frame import Frame as ScaleAIFrame
+from dto.scale_ai.frame import Frame3D as ScaleAIFrame3D
+from dto.scale_ai.instance import Coord3D as ScaleAICoord3D
+from dto.scale_ai.instance import Instance as ScaleAIInstance
+from dto.scale_ai.instance import Instance3D as ScaleAIInstance3D
+from dto.scale_ai.label import Label as ScaleAILabel
+from utils.common import open_file
+from utils.instance_converter import bat3d_instances_to_kitti
+
+OUTPUT_RIG_DATE = '210518'  # a `not_reversed` date of utils.output_rig
+PCD_FIELDS = ('x', 'y', 'z', 'intensity')
+CLASSES = ('Car', 'Pedestrian', 'Motorbike', 'Truck', 'Others')
+CLASS_SIZES = {
+    # (width, length, height) in meters
+    'Car': (1.8, 4.5, 1.5),
+    'Pedestrian': (0.6, 0.6, 1.7),
+    'Motorbike': (0.7, 1.9, 1.4),
+    'Truck': (2.5, 9.0, 3.2),
+    'Others': (1.0, 1.0, 1.0),
+}
+
+# Camera folder, rig name and horizontal field of view in degrees
+CAMERAS = (
+    ('CAM_FRONT_LEFT', 'cameraMainFov60', 60.0),
+    ('CAM_FRONT', 'cameraFov30', 30.0),
+    ('CAM_FRONT_RIGHT', 'cameraFov150', 150.0),
+)
+
+# Roll-pitch-yaw (ZYX euler angles) from the lidar frame (x forward, y left, z up) to the camera frame
+# (x right, y down, z forward), slightly off the ideal mounting so that transforms are not trivial
+LIDAR_TO_CAMERA_RPY = (np.pi / 2 + 0.02, -np.pi / 2 + 0.03, 0.01)
+LIDAR_TO_CAMERA_TRANSLATION = np.array([0.0, 0.3, -0.2])
+LIDAR_HEIGHT = 1.7
+
+
+def camera_intrinsic(image_size: Tuple[int, int], fov: float) -> np.ndarray:
+    width, height = image_size
+    focal = width / 2 / np.tan(np.radians(min(fov, 120.0)) / 2)
+    return np.array([
+        [focal, 0.0, width / 2],
+        [0.0, focal, height / 2],
+        [0.0, 0.0, 1.0],
+    ])
+
+
+def camera_extrinsic() -> np.ndarray:
+    from scipy.spatial.transform import Rotation as R
+
+    rotation = R.from_euler('ZYX', LIDAR_TO_CAMERA_RPY).as_matrix()
+    return np.hstack((rotation, LIDAR_TO_CAMERA_TRANSLATION[:, None]))
+
+
+def write_output_rig(rig_file: str, image_size: Tuple[int, int]) -> None:
+    '''Writes an output-rig json file which utils.output_rig can parse.'''
+    cameras = []
+    nominal_sensors = {}
+
+    for _, cam_name, fov in CAMERAS:
+        intrinsic = camera_intrinsic(image_size, fov)
+        cameras.append({
+            'name': cam_name,
+            'properties': {
+                'cx': str(intrinsic[0, 2]),
+                'cy': str(intrinsic[1, 2]),
+                'fx': str(intrinsic[0, 0]),
+                'fy': str(intrinsic[1, 1]),
+            },
+        })
+        nominal_sensors[f'nominalSensor2{cam_name}'] = {
+            'roll-pitch-yaw': list(LIDAR_TO_CAMERA_RPY),
+            't': LIDAR_TO_CAMERA_TRANSLATION.tolist(),
+        }
+
+    rig = {
+        'rig': {
+            'sensors': cameras + [nominal_sensors],
+        },
+    }
+
+    with open_file(rig_file, mode='w', encoding='utf-8') as f:
+        json.dump(rig, f, indent=4)
+
+
+def write_pcd(pcd_file: str, points: np.ndarray, data: str = 'binary') -> None:
+    '''
+        Writes a (N, 4) float32 array of x, y, z, intensity as a PCD file.
+
+        `data` is 'binary', 'ascii' or 'binary_compressed'. Compressed files are written with literal-only LZF
+        blocks, which every LZF decoder accepts.
+    '''
+    points = np.ascontiguousarray(points, dtype=np.float32)
+    header = '\n'.join([
+        '# .PCD v0.7 - Point Cloud Data file format',
+        'VERSION 0.7',
+        f'FIELDS {" ".join(PCD_FIELDS)}',
+        'SIZE 4 4 4 4',
+        'TYPE F F F F',
+        'COUNT 1 1 1 1',
+        f'WIDTH {len(points)}',
+        'HEIGHT 1',
+        'VIEWPOINT 0 0 0 1 0 0 0',
+        f'POINTS {len(points)}',
+        f'DATA {data}',
+    ]) + '\n'
+
+    path = Path(pcd_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with path.open(mode='wb') as f:
+        f.write(header.encode('ascii'))
+
+        if data == 'binary':
+            f.write(points.tobytes())
+        elif data == 'ascii':
+            np.savetxt(f, points, fmt='%.6f')
+        elif data == 'binary_compressed':
+            raw = points.T.tobytes()  # binary_compressed stores fields one after another
+            compressed = bytearray()
+
+            for start in range(0, len(raw), 32):
+                chunk = raw[start:start + 32]
+                compressed.append(len(chunk) - 1)
+                compressed.extend(chunk)
+
+            f.write(np.array([len(compressed), len(raw)], dtype=np.uint32).tobytes())
+            f.write(bytes(compressed))
+        else:
+            raise ValueError(f'Unsupported PCD data type {data}.')
+
+
+def make_tracks(rng: np.random.Generator, n_instances: int) -> List[dict]:
+    tracks = []
+
+    for track_id in range(n_instances):
+        class_ = CLASSES[rng.integers(len(CLASSES))]
+        width, length, height = CLASS_SIZES[class_]
+        scale = rng.uniform(0.9, 1.1)
+        tracks.append({
+            'class': class_,
+            'size': (width * scale, length * scale, height * scale),
+            'position': np.array([rng.uniform(6.0, 45.0), rng.uniform(-12.0, 12.0)]),
+            'velocity': rng.uniform(-0.5, 0.5, size=2),
+            'yaw': rng.uniform(-np.pi, np.pi),
+            'track_id': track_id,
+        })
+
+    return tracks
+
+
+def make_frame_instances(tracks: List[dict], frame_id: int) -> List[BAT3DInstance]:
+    instances = []
+
+    for track in tracks:
+        width, length, height = track['size']
+        x, y = track['position'] + track['velocity'] * frame_id
+        z = -LIDAR_HEIGHT + height / 2
+        instances.append(BAT3DInstance(track['class'], float(width), float(length), float(height), float(x),
+                                       float(y), float(z), float(track['yaw']), track['track_id'], frame_id))
+
+    return instances
+
+
+def make_point_cloud(rng: np.random.Generator, instances: List[BAT3DInstance], n_points: int) -> np.ndarray:
+    n_object_points = min(n_points // 4, 200 * len(instances))
+    n_ground_points = n_points - n_object_points
+
+    # Ground returns spread on rings around the sensor
+    distances = rng.uniform(2.0, 80.0, size=n_ground_points)
+    angles = rng.uniform(-np.pi, np.pi, size=n_ground_points)
+    ground = np.stack([
+        distances * np.cos(angles),
+        distances * np.sin(angles),
+        rng.normal(-LIDAR_HEIGHT, 0.03, size=n_ground_points),
+    ], axis=1)
+
+    # Returns inside the boxes
+    objects = np.zeros((0, 3))
+
+    if instances and n_object_points:
+        ids = rng.integers(len(instances), size=n_object_points)
+        sizes = np.array([[ins.width, ins.length, ins.height] for ins in instances])[ids]
+        centers = np.array([[ins.x, ins.y, ins.z] for ins in instances])[ids]
+        yaws = np.array([ins.rotationY for ins in instances])[ids]
+        local = rng.uniform(-0.5, 0.5, size=(n_object_points, 3)) * sizes
+        cos, sin = np.cos(yaws), np.sin(yaws)
+        objects = np.stack([
+            cos * local[:, 0] - sin * local[:, 1],
+            sin * local[:, 0] + cos * local[:, 1],
+            local[:, 2],
+        ], axis=1) + centers
+
+    xyz = np.vstack([ground, objects])
+    intensity = rng.uniform(0.0, 255.0, size=(len(xyz), 1))
+    return np.hstack([xyz, intensity]).astype(np.float32)
+
+
+def make_image(rng: np.random.Generator, image_size: Tuple[int, int]) -> np.ndarray:
+    width, height = image_size
+    gradient = np.linspace(40, 200, height, dtype=np.float32)[:, None, None]
+    image = np.broadcast_to(gradient, (height, width, 3)).copy()
+    image += rng.normal(0.0, 8.0, size=(height // 8 + 1, width // 8 + 1, 3)).repeat(8, 0).repeat(8, 1)[:height, :width]
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def make_cvat_frame(frame_id: int, image_name: str, image_size: Tuple[int, int],
+                    instances: List[BAT3DInstance], extrinsic: np.ndarray, intrinsic: np.ndarray) -> CVATFrame:
+    cvat_instances = []
+
+    kitti_instances = bat3d_instances_to_kitti(instances, extrinsic, intrinsic, image_size)
+
+    for instance, kitti_instance in zip(instances, kitti_instances):
+        left, top, right, bottom = map(float, kitti_instance.bbox)
+
+        if right <= left or bottom <= top:
+            continue
+
+        attribs = [CVATAttrib('trackId', str(instance.trackId))]
+        cvat_instances.append(CVATInstance(frame_id, 1, instance.class_, 0, 0, 'manual',
+                                           left, left, right, right, left, left, right, right,
+                                           bottom, bottom, bottom, bottom, top, top, top, top, 0, attribs))
+
+    return CVATFrame(image_size[1], frame_id, image_name, image_size[0], cvat_instances)
+
+
+def make_scale_ai_frame(frame_id: int, instances: List[BAT3DInstance]) -> ScaleAIFrame3D:
+    cuboids: List[ScaleAIInstance] = [
+        ScaleAIInstance3D(f'{instance.trackId}', instance.class_, ScaleAICoord3D(instance.x, instance.y, instance.z),
+                          ScaleAICoord3D(instance.width, instance.length, instance.height), instance.rotationY, False,
+                          0, 100)
+        for instance in instances
+    ]
+    return ScaleAIFrame3D(frame_id, cuboids)
+
+
+def make_sequence(seq_dir: str, n_frames: int = 10, n_points: int = 120000, n_instances: int = 10,
+                  image_size: Tuple[int, int] = (1280, 720), pcd_data: str = 'binary', seed: int = 0) -> None:
+    '''
+        Creates a fake sequence laid out as a BAT3D delivery:
+            pointclouds_org/<frame>.pcd
+            images/CAM_FRONT*/<frame>.jpeg
+            output-rig-<date>.json
+            annotations/{LIDAR_TOP,CAM_FRONT*}/NuScenes_<seq>_annotations.json
+            linking_annotations/linking.xml (CVAT, CAM_FRONT images)
+            scale_ai_annotations/scale_ai.json (ScaleAI cuboids)
+    '''
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    seq_path = Path(seq_dir)
+    seq_name = seq_path.name
+    extrinsic = camera_extrinsic()
+    tracks = make_tracks(rng, n_instances)
+    cvat_intrinsic = camera_intrinsic(image_size, dict((cam_dir, fov) for cam_dir, _, fov in CAMERAS)['CAM_FRONT'])
+
+    write_output_rig(str(seq_path.joinpath(f'output-rig-{OUTPUT_RIG_DATE}.json')), image_size)
+
+    bat3d_frames = []
+    cvat_frames = []
+    scale_ai_frames: List[ScaleAIFrame] = []
+
+    for frame_id in range(n_frames):
+        frame_name = f'{frame_id:06d}'
+        instances = make_frame_instances(tracks, frame_id)
+
+        point_cloud = make_point_cloud(rng, instances, n_points)
+        write_pcd(str(seq_path.joinpath('pointclouds_org', f'{frame_name}.pcd')), point_cloud, pcd_data)
+
+        for cam_dir, _, _ in CAMERAS:
+            image_file = seq_path.joinpath('images', cam_dir, f'{frame_name}.jpeg')
+            image_file.parent.mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(str(image_file), make_image(rng, image_size))
+
+        cvat_frames.append(make_cvat_frame(frame_id, f'{frame_name}.jpeg', image_size, instances, extrinsic,
+                                           cvat_intrinsic))
+        scale_ai_frames.append(make_scale_ai_frame(frame_id, instances))
+        bat3d_frames.append(BAT3DFrame(frame_id, instances))
+
+    bat3d_label = BAT3DLabel(bat3d_frames)
+
+    for anno_dir in ['LIDAR_TOP'] + [cam_dir for cam_dir, _, _ in CAMERAS]:
+        bat3d_label.tofile(str(seq_path.joinpath('annotations', anno_dir, f'NuScenes_{seq_name}_annotations.json')))
+
+    CVATLabel(cvat_frames).tofile(str(seq_path.joinpath('linking_annotations', 'linking.xml')))
+    ScaleAILabel(scale_ai_frames).tofile(str(seq_path.joinpath('scale_ai_annotations', 'scale_ai.json')))
+
+
+def make_delivery(root_dir: str, n_seqs: int = 2, seed: int = 0, **kwargs: Any) -> List[str]:
+    '''Creates `n_seqs` sequences named 1..n_seqs under `root_dir` and returns their paths.'''
+    seq_dirs = []
+
+    for i in range(1, n_seqs + 1):
+        seq_dir = str(Path(root_dir).joinpath(str(i)))
+        make_sequence(seq_dir, seed=seed + i, **kwargs)
+        seq_dirs.append(seq_dir)
+
+    return seq_dirs
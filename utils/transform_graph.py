@@ -0,0 +1,98 @@
+from collections import deque
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.matrix import homo_mat, map_dimension
+
+
+class TransformGraph:
+    '''
+        Transforms between the named frames of a sequence, e.g. 'lidar', 'camera', 'kitti_velo' and 'image'.
+
+        Transforms are added as edges between two frames, the inverse edge is added too unless the transform is a
+        projection. The transform between any two connected frames is composed along the shortest path and
+        memoized, as is the axis permutation between them, so hot loops get them without recomputing anything.
+    '''
+
+    def __init__(self):
+        self._edges: Dict[str, Dict[str, np.ndarray]] = {}  # src -> dst -> (4, 4) matrix
+        self._transforms: Dict[Tuple[str, str], np.ndarray] = {}
+        self._axis_permutations: Dict[Tuple[str, str], Tuple[int, int, int]] = {}
+
+    @property
+    def frames(self) -> List[str]:
+        frames = set(self._edges)
+
+        for edges in self._edges.values():
+            frames.update(edges)
+
+        return sorted(frames)
+
+    def add(self, src: str, dst: str, transform_matrix: np.ndarray, invertible: bool = True) -> None:
+        '''
+            Args:
+                transform_matrix: (3, 4) or (4, 4) matrix from `src` to `dst`.
+                invertible: Whether to add the inverse transform from `dst` to `src`, False for projections.
+        '''
+        transform_matrix = homo_mat(np.asarray(transform_matrix, dtype=np.float64))
+        self._edges.setdefault(src, {})[dst] = transform_matrix
+
+        if invertible:
+            self._edges.setdefault(dst, {})[src] = np.linalg.inv(transform_matrix)
+
+        # Paths may be shorter with the new edges
+        self._transforms.clear()
+        self._axis_permutations.clear()
+
+    def find_path(self, src: str, dst: str) -> List[str]:
+        prev_frames = {src: src}
+        queue = deque([src])
+
+        while queue:
+            frame = queue.popleft()
+
+            if frame == dst:
+                path = [dst]
+
+                while path[-1] != src:
+                    path.append(prev_frames[path[-1]])
+
+                return path[::-1]
+
+            for next_frame in self._edges.get(frame, {}):
+                if next_frame not in prev_frames:
+                    prev_frames[next_frame] = frame
+                    queue.append(next_frame)
+
+        raise KeyError(f'No transform from {src} to {dst}.')
+
+    def get(self, src: str, dst: str, ret_homo: bool = False) -> np.ndarray:
+        '''Returns the transform from `src` to `dst`, (4, 4) if `ret_homo` else (3, 4). Do not modify it in place.'''
+        key = (src, dst)
+
+        if key not in self._transforms:
+            path = self.find_path(src, dst)
+            transform_matrix = np.identity(4)
+
+            for frame, next_frame in zip(path[:-1], path[1:]):
+                transform_matrix = self._edges[frame][next_frame] @ transform_matrix
+
+            transform_matrix.flags.writeable = False
+            self._transforms[key] = transform_matrix
+
+        transform_matrix = self._transforms[key]
+        return transform_matrix if ret_homo else transform_matrix[:3]
+
+    def get_axis_permutation(self, src: str, dst: str) -> Tuple[int, int, int]:
+        '''
+            Returns the axes of `src` which x, y and z of `dst` are mostly along, e.g. sizes of boxes in `src` are
+            moved to `dst` with `sizes[:, permutation]`. See `utils.matrix.map_dimension`.
+        '''
+        key = (src, dst)
+
+        if key not in self._axis_permutations:
+            self._axis_permutations[key] = map_dimension(self.get(src, dst), {'x': 0, 'y': 1, 'z': 2},
+                                                         {'width': 'x', 'height': 'y', 'length': 'z'})
+
+        return self._axis_permutations[key]